@@ -3,13 +3,19 @@
 All filesystem paths are resolved relative to the project root.
 The project root is detected by walking upward until a marker
 file (e.g., `pyproject.toml` or `.git`) is found.
+
+Set `SDGEN_SKIP_FS_INIT=1` to skip creating the directory tree at
+import time (read-only deployments, tooling).
 """
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def _detect_project_root() -> Path:
     """Return the project root by scanning upward for a marker file."""
     current = Path(__file__).resolve()
@@ -25,20 +31,27 @@ def _detect_project_root() -> Path:
 PROJECT_ROOT: Path = _detect_project_root()
 
 ASSETS_ROOT: Path = PROJECT_ROOT / "src" / "assets"
-ASSETS_ROOT.mkdir(parents=True, exist_ok=True)
 
 HISTORY_ROOT: Path = ASSETS_ROOT / "history"
 HISTORY_ENTRIES_DIR: Path = HISTORY_ROOT / "entries"
 HISTORY_THUMBS_DIR: Path = HISTORY_ROOT / "thumbnails"
 HISTORY_FULL_DIR: Path = HISTORY_ROOT / "full"
 
-for p in [
-    HISTORY_ROOT,
-    HISTORY_ENTRIES_DIR,
-    HISTORY_THUMBS_DIR,
-    HISTORY_FULL_DIR,
-]:
-    p.mkdir(parents=True, exist_ok=True)
-
 LOGS_ROOT: Path = PROJECT_ROOT / "logs"
-LOGS_ROOT.mkdir(parents=True, exist_ok=True)
+
+
+def _init_dirs() -> None:
+    """Create the asset, history and log directories if missing.
+
+    This is the only place the directory tree is created, so
+    `SDGEN_SKIP_FS_INIT=1` leaves the filesystem untouched.
+    """
+    if os.getenv("SDGEN_SKIP_FS_INIT") == "1":
+        return
+
+    # makedirs also creates ASSETS_ROOT and HISTORY_ROOT
+    for p in (HISTORY_ENTRIES_DIR, HISTORY_THUMBS_DIR, HISTORY_FULL_DIR, LOGS_ROOT):
+        os.makedirs(p, exist_ok=True)
+
+
+_init_dirs()
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -21,6 +22,10 @@ class AppSettings:
     - PORT: server port for Gradio
     - HOST: server host address
     - SHARE: enable Gradio public sharing link
+    - QUANTIZE: optional UNet quantization ("int8_weight", "w8a8", "fp8")
+    - OFFLOAD: optional CPU offload on CUDA ("model", "sequential")
+    - CPU_BF16: 1/0 to allow bf16 autocast on bf16-capable CPUs
+    - DEEPCACHE: 1/0 to enable DeepCache UNet feature caching
     """
 
     model_id1: str = os.getenv("MODEL_ID1", "runwayml/stable-diffusion-v1-5")
@@ -30,3 +35,7 @@ class AppSettings:
     server_port: int = int(os.getenv("PORT", "7860"))
     server_host: str = os.getenv("HOST", "0.0.0.0")
     share: bool = bool(int(os.getenv("SHARE", "1")))
+    quantize: Optional[str] = os.getenv("QUANTIZE") or None
+    offload: Optional[str] = os.getenv("OFFLOAD") or None
+    cpu_bf16: bool = bool(int(os.getenv("CPU_BF16", "0")))
+    deepcache: bool = bool(int(os.getenv("DEEPCACHE", "0")))
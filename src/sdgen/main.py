@@ -54,16 +54,28 @@ def main() -> None:
             device=device,
             use_fp16=device == "cuda",
             enable_xformers=settings.enable_xformers,
+            quantize=settings.quantize,
+            offload=settings.offload,
+            cpu_bf16=settings.cpu_bf16,
+            deepcache=settings.deepcache,
         ),
         "Turbo": load_pipeline(
             model_id=model_id2,
             device=device,
             use_fp16=device == "cuda",
             enable_xformers=settings.enable_xformers,
+            quantize=settings.quantize,
+            offload=settings.offload,
+            cpu_bf16=settings.cpu_bf16,
+            # Turbo runs < DEEPCACHE_MIN_STEPS steps; the helper would only
+            # disable torch.compile
+            deepcache=False,
         ),
     }
     if device == "cuda" and settings.warmup:
-        warmup_pipeline(pipes["Turbo"])
+        # SD1.5 is served with CFG (UNet batch 2); Turbo runs without guidance
+        warmup_pipeline(pipes["SD1.5"])
+        warmup_pipeline(pipes["Turbo"], guidance_scale=0.0)
 
     img2img_pipes = {
         "SD1.5": prepare_img2img_pipeline(pipes["SD1.5"]),
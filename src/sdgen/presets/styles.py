@@ -6,10 +6,11 @@ negative prompt, sampler parameters, and recommended resolutions.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple
 
-# Global preset registry: {preset_name: parameters}
-PRESETS: Dict[str, Dict[str, Any]] = {
+# Preset definitions: {preset_name: parameters}
+_PRESET_DATA: Dict[str, Dict[str, Any]] = {
     "Realistic Photo": {
         "prompt": (
             "ultra realistic, 35mm photography, \
@@ -53,13 +54,24 @@ high detail, synthwave aesthetic"
 }
 
 
-def get_preset(name: str) -> Dict[str, Any] | None:
-    """Return a shallow copy of a preset by name."""
-    data = PRESETS.get(name)
-    return dict(data) if data else None
+def _freeze(data: Dict[str, Any]) -> Mapping[str, Any]:
+    """Return a read-only view of a preset with list values as tuples."""
+    frozen = {k: tuple(v) if isinstance(v, list) else v for k, v in data.items()}
+    return MappingProxyType(frozen)
 
 
-def list_presets() -> List[str]:
+# Global preset registry: {preset_name: read-only parameters}
+PRESETS: Mapping[str, Mapping[str, Any]] = MappingProxyType(
+    {name: _freeze(data) for name, data in _PRESET_DATA.items()}
+)
+
+
+def get_preset(name: str) -> Mapping[str, Any] | None:
+    """Return a read-only preset by name; safe to share without copying."""
+    return PRESETS.get(name)
+
+
+def list_presets() -> Tuple[str, ...]:
     """List preset names in a stable UI order."""
     # Avoid unexpected reordering: use insertion order
-    return list(PRESETS.keys())
+    return tuple(PRESETS)
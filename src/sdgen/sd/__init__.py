@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from .generator import generate_image
+from .generator import generate_image, generate_images
 from .img2img import generate_img2img, prepare_img2img_pipeline
 from .models import GenerationMetadata, HistorySummary, Img2ImgConfig, Txt2ImgConfig
 from .pipeline import load_pipeline, warmup_pipeline
@@ -11,6 +11,7 @@ __all__ = [
     "GenerationMetadata",
     "HistorySummary",
     "generate_image",
+    "generate_images",
     "generate_img2img",
     "prepare_img2img_pipeline",
     "load_pipeline",
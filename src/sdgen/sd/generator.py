@@ -3,74 +3,134 @@
 from __future__ import annotations
 
 import time
-from typing import Tuple
+from typing import List, Optional, Sequence, Tuple
 
 import torch
 from PIL import Image
 
 from sdgen.sd.models import GenerationMetadata, Txt2ImgConfig
+from sdgen.sd.pipeline import deepcache_context
+from sdgen.sd.precision import autocast_context
+from sdgen.sd.rng import get_generator, random_seed
 from sdgen.utils.common import validate_resolution
 from sdgen.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def generate_image(
+def resolve_guidance(
+    guidance_scale: float,
+    negative_prompt: Optional[str],
+) -> Tuple[float, Optional[str]]:
+    """Return the (guidance scale, negative prompt) to call a pipeline with.
+
+    CFG <= 1 is a no-op, so it is turned off entirely (scale 0, no negative
+    prompt) and the UNet runs a single, not doubled, batch per step.
+    """
+    if guidance_scale <= 1.0:
+        return 0.0, None
+    return guidance_scale, negative_prompt or None
+
+
+def generate_images(
     pipe: any,
     cfg: Txt2ImgConfig,
-) -> Tuple[Image.Image, GenerationMetadata]:
-    """Generate an image from text using a Stable Diffusion pipeline.
+    prompts: Optional[Sequence[str]] = None,
+    seeds: Optional[Sequence[Optional[int]]] = None,
+) -> List[Tuple[Image.Image, GenerationMetadata]]:
+    """Generate a batch of images in a single pipeline call.
+
+    All images share the UNet forward pass of each denoising step, which is
+    considerably faster than running one pipeline call per image.
 
     Args:
         pipe: A diffusers StableDiffusionPipeline instance.
-        cfg: Structured configuration for text-to-image generation.
+        cfg: Shared text-to-image settings; `cfg.prompt` and `cfg.seed`
+            are used when `prompts` or `seeds` are not given.
+        prompts: Optional per-image prompts.
+        seeds: Optional per-image seeds (`None` entries are randomized).
+
+    Raises:
+        ValueError: If `prompts` and `seeds` have different lengths.
 
     Returns:
-        A tuple of (PIL image, GenerationMetadata).
+        A list of (PIL image, GenerationMetadata) tuples, one per image.
     """
+    prompts = list(prompts) if prompts else None
+    seeds = list(seeds) if seeds else None
+    if prompts and seeds and len(prompts) != len(seeds):
+        raise ValueError("prompts and seeds must have the same length.")
+
+    batch = len(prompts or seeds or [cfg.prompt])
+    prompts = prompts or [cfg.prompt] * batch
+    seeds = seeds or [cfg.seed] * batch
+    seeds = [random_seed() if s is None else int(s) for s in seeds]
+
+    steps = int(cfg.steps)
+    cfg_scale = float(cfg.guidance_scale)
     width, height = validate_resolution(cfg.width, cfg.height)
     start = time.time()
 
-    seed = cfg.seed
-    if seed is None:
-        seed = int(torch.seed() & ((1 << 63) - 1))
-
     device = cfg.device
-    gen = torch.Generator("cpu" if device == "cpu" else device).manual_seed(int(seed))
+    if batch == 1:
+        gens = [get_generator(device, seeds[0])]
+    else:
+        gens = [torch.Generator(device).manual_seed(s) for s in seeds]
 
     logger.info(
-        "txt2img: steps=%s cfg=%s res=%sx%s seed=%s",
-        cfg.steps,
-        cfg.guidance_scale,
+        "txt2img: batch=%s steps=%s cfg=%s res=%sx%s seeds=%s",
+        batch,
+        steps,
+        cfg_scale,
         width,
         height,
-        seed,
+        seeds,
     )
 
-    autocast_device = device if device == "cuda" else "cpu"
-    with torch.autocast(device_type=autocast_device):
+    guidance, negative = resolve_guidance(cfg_scale, cfg.negative_prompt)
+
+    caching = deepcache_context(pipe, steps)
+    with torch.inference_mode(), autocast_context(pipe, device), caching:
         out = pipe(
-            prompt=cfg.prompt,
-            negative_prompt=cfg.negative_prompt or None,
+            prompt=prompts,
+            negative_prompt=[negative] * batch if negative else None,
             width=width,
             height=height,
-            num_inference_steps=int(cfg.steps),
-            guidance_scale=float(cfg.guidance_scale),
-            generator=gen,
+            num_inference_steps=steps,
+            guidance_scale=guidance,
+            generator=gens,
         )
 
-    img = out.images[0]
     elapsed = time.time() - start
 
-    meta = GenerationMetadata(
-        mode="txt2img",
-        prompt=cfg.prompt,
-        negative_prompt=cfg.negative_prompt or "",
-        steps=int(cfg.steps),
-        guidance_scale=float(cfg.guidance_scale),
-        width=width,
-        height=height,
-        seed=int(seed),
-        elapsed_seconds=float(elapsed),
-    )
-    return img, meta
+    results = []
+    for img, prompt, seed in zip(out.images, prompts, seeds):
+        meta = GenerationMetadata(
+            mode="txt2img",
+            prompt=prompt,
+            negative_prompt=cfg.negative_prompt or "",
+            steps=steps,
+            guidance_scale=cfg_scale,
+            width=width,
+            height=height,
+            seed=seed,
+            elapsed_seconds=elapsed,
+        )
+        results.append((img, meta))
+    return results
+
+
+def generate_image(
+    pipe: any,
+    cfg: Txt2ImgConfig,
+) -> Tuple[Image.Image, GenerationMetadata]:
+    """Generate an image from text using a Stable Diffusion pipeline.
+
+    Args:
+        pipe: A diffusers StableDiffusionPipeline instance.
+        cfg: Structured configuration for text-to-image generation.
+
+    Returns:
+        A tuple of (PIL image, GenerationMetadata).
+    """
+    return generate_images(pipe, cfg)[0]
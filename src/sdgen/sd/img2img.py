@@ -2,74 +2,155 @@
 
 from __future__ import annotations
 
+import os
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Union
 
+import numpy as np
 import torch
-from diffusers import StableDiffusionImg2ImgPipeline
+from diffusers import StableDiffusionImg2ImgPipeline, StableDiffusionPipeline
 from PIL import Image
 
+from sdgen.sd.generator import resolve_guidance
 from sdgen.sd.models import GenerationMetadata, Img2ImgConfig
+from sdgen.sd.pipeline import HALF_DTYPES, deepcache_context
+from sdgen.sd.precision import autocast_context
+from sdgen.sd.rng import get_generator, random_seed
 from sdgen.utils.common import validate_resolution
 from sdgen.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+ImageSource = Union[Image.Image, str, "os.PathLike[str]"]
+
+# {id(base_pipe): img2img pipe}; entries vanish once the wrapper is unused
+_IMG2IMG_CACHE: "weakref.WeakValueDictionary[int, StableDiffusionImg2ImgPipeline]" = (
+    weakref.WeakValueDictionary()
+)
+
+# Decodes/resizes init images while the caller finishes request setup
+_PREPROCESS_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="img2img-prep")
+
+
+@lru_cache(maxsize=8)
+def _open_rgb(path: str, mtime: float) -> Image.Image:
+    """Decode an image file to RGB; cached per (path, mtime)."""
+    with Image.open(path) as handle:
+        return handle.convert("RGB")
+
+
+def _load_init_image(image: ImageSource, width: int, height: int) -> Image.Image:
+    """Return the init image as RGB at exactly `(width, height)`.
+
+    Path inputs are decoded once and cached until the file changes. Images
+    already in RGB at the target size are returned unchanged. Large
+    downscales are pre-reduced with a cheap box filter and finished with
+    BILINEAR; smaller inputs use LANCZOS.
+    """
+    if isinstance(image, Image.Image):
+        img = image if image.mode == "RGB" else image.convert("RGB")
+    else:
+        path = os.fspath(image)
+        img = _open_rgb(path, os.path.getmtime(path))
+
+    if img.size == (width, height):
+        return img
+
+    # The VAE downsamples 8x right away, so LANCZOS quality is invisible
+    # for large uploads; use it only for near-target-size inputs
+    if max(img.size) < 2 * max(width, height):
+        resample = Image.Resampling.LANCZOS
+    else:
+        resample = Image.Resampling.BILINEAR
+
+    factor = min(img.width // width, img.height // height)
+    if factor >= 2:
+        img = img.reduce(factor)
+
+    return img.resize((width, height), resample)
+
 
 def prepare_img2img_pipeline(
-    base_pipe: StableDiffusionImg2ImgPipeline,
-    model_id: str = "runwayml/stable-diffusion-v1-5",
+    base_pipe: StableDiffusionPipeline,
 ) -> StableDiffusionImg2ImgPipeline:
-    """Create an Img2Img pipeline using an existing base pipeline.
+    """Create an Img2Img pipeline sharing the components of a base pipeline.
+
+    Attempts `from_pipe` first, then falls back to constructing the
+    pipeline directly from the base components. Neither path loads new
+    weights, and attention/VAE settings applied by `load_pipeline` carry
+    over because the UNet and VAE instances are shared.
 
-    Attempts `from_pipe` first for efficiency, then falls back to
-    a clean `from_pretrained` load if necessary.
+    Repeated calls with the same base pipeline return the cached wrapper.
 
     Args:
         base_pipe: Loaded text-to-image Stable Diffusion pipeline.
-        model_id: Fallback Hugging Face model ID.
 
     Returns:
         Configured `StableDiffusionImg2ImgPipeline`.
     """
+    cached = _IMG2IMG_CACHE.get(id(base_pipe))
+    # Guard against id() reuse after the original base pipeline was freed
+    if cached is not None and cached._base_pipe_ref() is base_pipe:
+        return cached
+
     try:
         pipe = StableDiffusionImg2ImgPipeline.from_pipe(base_pipe)
         logger.info("Img2Img pipeline created via from_pipe().")
     except Exception as exc:
-        logger.warning("from_pipe() failed: %s → falling back.", exc)
-        pipe = StableDiffusionImg2ImgPipeline.from_pretrained(
-            model_id,
-            torch_dtype=base_pipe.unet.dtype,
+        logger.warning("from_pipe() failed: %s → building from components.", exc)
+        pipe = StableDiffusionImg2ImgPipeline(
+            vae=base_pipe.vae,
+            text_encoder=base_pipe.text_encoder,
+            tokenizer=base_pipe.tokenizer,
+            unet=base_pipe.unet,
+            scheduler=base_pipe.scheduler,
             safety_checker=None,
+            feature_extractor=base_pipe.feature_extractor,
+            requires_safety_checker=False,
         )
-        device = next(base_pipe.unet.parameters()).device
-        pipe = pipe.to(device)
-
-    # Optimizations
-    try:
-        pipe.enable_attention_slicing()
-    except Exception:
-        pass
 
-    try:
-        if hasattr(pipe.vae, "enable_tiling"):
-            pipe.vae.enable_tiling()
-    except Exception:
-        pass
+    # from_pipe() builds a new object, so carry over the precision flags
+    pipe._is_half = pipe.unet.dtype in HALF_DTYPES
+    pipe._cpu_bf16 = getattr(base_pipe, "_cpu_bf16", False)
+    pipe._deepcache_helper = getattr(base_pipe, "_deepcache_helper", None)
 
+    pipe._base_pipe_ref = weakref.ref(base_pipe)
+    _IMG2IMG_CACHE[id(base_pipe)] = pipe
     return pipe
 
 
+def _to_input_tensor(
+    image: Image.Image,
+    device: str,
+    dtype: torch.dtype,
+) -> torch.Tensor:
+    """Convert an RGB image to a (1, 3, H, W) tensor in [0, 1] on `device`.
+
+    Pixels are uploaded as uint8 (a quarter of the float bytes) and scaled
+    to float on the device. Passing a tensor skips the pipeline's own
+    PIL -> numpy -> torch preprocessing.
+    """
+    # np.array (not asarray): torch.from_numpy needs a writable buffer
+    pixels = torch.from_numpy(np.array(image)).permute(2, 0, 1).unsqueeze(0)
+
+    return pixels.to(device).to(dtype=dtype).div_(255.0)
+
+
 def generate_img2img(
     pipe: StableDiffusionImg2ImgPipeline,
     cfg: Img2ImgConfig,
-    init_image: Image.Image,
+    init_image: ImageSource,
 ) -> tuple[Image.Image, GenerationMetadata]:
     """Run Img2Img generation using the configured pipeline and metadata config.
 
     Args:
         pipe: Stable Diffusion Img2Img pipeline.
         cfg: Img2Img inference settings (prompt, steps, etc.).
-        init_image: The source image to transform.
+        init_image: The source image to transform, as a PIL image or a
+            file path.
 
     Raises:
         ValueError: If strength is outside (0, 1].
@@ -77,60 +158,66 @@ def generate_img2img(
     Returns:
         A tuple of `(output_image, metadata)`.
     """
-    if not (0.0 < cfg.strength <= 1.0):
+    steps = int(cfg.steps)
+    cfg_scale = float(cfg.guidance_scale)
+    strength = float(cfg.strength)
+    if not (0.0 < strength <= 1.0):
         raise ValueError("strength must be in (0, 1].")
 
     width, height = validate_resolution(cfg.width, cfg.height)
     start = time.time()
 
-    # Deterministic seed
-    seed = cfg.seed
-    if seed is None:
-        seed = int(torch.seed() & ((1 << 63) - 1))
+    # Resize input in the background
+    init_future = _PREPROCESS_POOL.submit(_load_init_image, init_image, width, height)
 
-    # Resize input
-    init = init_image.convert("RGB").resize((width, height), Image.LANCZOS)
+    # Deterministic seed
+    seed = random_seed() if cfg.seed is None else int(cfg.seed)
 
     # Correct generator device
     device = cfg.device if cfg.device in ("cuda", "cpu") else "cuda"
-    generator = torch.Generator(device).manual_seed(int(seed))
+    generator = get_generator(device, seed)
 
     logger.info(
         "img2img: steps=%s cfg=%s strength=%.2f res=%sx%s seed=%s",
-        cfg.steps,
-        cfg.guidance_scale,
-        cfg.strength,
+        steps,
+        cfg_scale,
+        strength,
         width,
         height,
         seed,
     )
 
-    # Autocast context
-    autocast_device = "cuda" if device == "cuda" else "cpu"
-    with torch.autocast(device_type=autocast_device):
+    guidance, negative = resolve_guidance(cfg_scale, cfg.negative_prompt)
+
+    init = _to_input_tensor(init_future.result(), device, pipe.vae.dtype)
+
+    start_gpu = time.time()
+    caching = deepcache_context(pipe, steps)
+    with torch.inference_mode(), autocast_context(pipe, device), caching:
         out = pipe(
             prompt=cfg.prompt,
-            negative_prompt=cfg.negative_prompt or None,
+            negative_prompt=negative,
             image=init,
-            strength=float(cfg.strength),
-            num_inference_steps=int(cfg.steps),
-            guidance_scale=float(cfg.guidance_scale),
+            strength=strength,
+            num_inference_steps=steps,
+            guidance_scale=guidance,
             generator=generator,
         )
 
     img = out.images[0]
-    elapsed = time.time() - start
+    end = time.time()
 
     meta = GenerationMetadata(
         mode="img2img",
         prompt=cfg.prompt,
         negative_prompt=cfg.negative_prompt or "",
-        steps=int(cfg.steps),
-        guidance_scale=float(cfg.guidance_scale),
+        steps=steps,
+        guidance_scale=cfg_scale,
         width=width,
         height=height,
-        seed=int(seed),
-        strength=float(cfg.strength),
-        elapsed_seconds=float(elapsed),
+        seed=seed,
+        strength=strength,
+        elapsed_seconds=end - start,
+        gpu_seconds=end - start_gpu,
     )
     return img, meta
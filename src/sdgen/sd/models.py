@@ -2,10 +2,33 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
-from datetime import datetime
+import time
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
+__all__ = [
+    "Txt2ImgConfig",
+    "Img2ImgConfig",
+    "GenerationMetadata",
+    "HistorySummary",
+    "now_iso",
+]
+
+
+def now_iso() -> str:
+    """Return the current UTC time as `YYYY-MM-DDTHH:MM:SS.ffffff`.
+
+    Same format as `datetime.utcnow().isoformat()`, but always with
+    microseconds, so entries saved within one second still sort in save
+    order.
+    """
+    secs, ns = divmod(time.time_ns(), 1_000_000_000)
+    tm = time.gmtime(secs)
+    return (
+        f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}T"
+        f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}.{ns // 1000:06d}"
+    )
+
 
 @dataclass
 class Txt2ImgConfig:
@@ -24,7 +47,7 @@ class Txt2ImgConfig:
 
     prompt: str
     negative_prompt: str = ""
-    steps: int = 30
+    steps: int = 20
     guidance_scale: float = 7.5
     width: int = 512
     height: int = 512
@@ -53,7 +76,7 @@ class Img2ImgConfig:
     init_image_path: Optional[str] = None
     negative_prompt: str = ""
     strength: float = 0.7
-    steps: int = 30
+    steps: int = 20
     guidance_scale: float = 7.5
     width: int = 512
     height: int = 512
@@ -75,7 +98,7 @@ class GenerationMetadata:
 
     # Shared
     elapsed_seconds: float = 0.0
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=now_iso)
     id: Optional[str] = None
     thumbnail: Optional[str] = None
     full_image: Optional[str] = None
@@ -89,6 +112,7 @@ class GenerationMetadata:
 
     # Img2Img only
     strength: Optional[float] = None
+    gpu_seconds: Optional[float] = None  # pipeline call only, excludes preprocessing
 
     # Upscale only
     scale: Optional[float] = None
@@ -99,7 +123,31 @@ class GenerationMetadata:
 
     def to_dict(self) -> Dict[str, Any]:
         """Drop None values for clean JSON."""
-        return {k: v for k, v in asdict(self).items() if v is not None}
+        # Flat scalar fields only, so no need for asdict()'s deep copy
+        items = ((f, getattr(self, f)) for f in self.__dataclass_fields__)
+        return {f: v for f, v in items if v is not None}
+
+
+# Fields written by the txt2img/img2img generators; keep the schema in sync
+_GENERATION_FIELDS = frozenset(
+    {
+        "mode",
+        "prompt",
+        "negative_prompt",
+        "steps",
+        "guidance_scale",
+        "width",
+        "height",
+        "seed",
+        "strength",
+        "elapsed_seconds",
+        "gpu_seconds",
+    }
+)
+_missing = _GENERATION_FIELDS - GenerationMetadata.__dataclass_fields__.keys()
+if _missing:
+    raise RuntimeError(f"GenerationMetadata lacks generator fields: {sorted(_missing)}")
+del _missing
 
 
 @dataclass
@@ -117,4 +165,4 @@ class HistorySummary:
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a serializable dict representation."""
-        return asdict(self)
+        return {f: getattr(self, f) for f in self.__dataclass_fields__}
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import contextlib
 import os
-from typing import Optional
+from typing import Any, Iterator, Optional, Sequence, Tuple
 
 import torch
 from diffusers import (
@@ -12,19 +13,161 @@ from diffusers import (
     StableDiffusionPipeline,
 )
 
+from sdgen.sd.rng import get_generator
+from sdgen.utils.common import validate_resolution
 from sdgen.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# (width, height) buckets warmed when no explicit shapes are given
+DEFAULT_WARMUP_SHAPES: Tuple[Tuple[int, int], ...] = ((512, 512), (768, 768))
 
-def _try_enable_xformers(pipe: StableDiffusionPipeline) -> None:
-    """Enable xFormers memory-efficient attention if available."""
+HALF_DTYPES: Tuple[torch.dtype, ...] = (torch.float16, torch.bfloat16)
+
+# Below this much VRAM, attention slicing is kept instead of SDPA
+LOW_VRAM_BYTES = 6 * 1024**3
+
+# Supported `load_pipeline(offload=...)` modes (CUDA only)
+OFFLOAD_MODES: Tuple[str, ...] = ("model", "sequential")
+
+# DeepCache feature reuse only pays off (and stays accurate) for longer runs
+DEEPCACHE_MIN_STEPS = 10
+
+# Supported `load_pipeline(quantize=...)` modes (requires torchao)
+QUANTIZE_MODES: Tuple[str, ...] = ("int8_weight", "w8a8", "fp8")
+
+
+def _try_enable_xformers(pipe: StableDiffusionPipeline) -> bool:
+    """Enable xFormers memory-efficient attention if available.
+
+    Returns:
+        True if xFormers attention was enabled, False otherwise.
+    """
     try:
         if hasattr(pipe, "enable_xformers_memory_efficient_attention"):
             pipe.enable_xformers_memory_efficient_attention()
             logger.info("Enabled xFormers memory-efficient attention.")
+            return True
     except Exception as exc:
         logger.info("xFormers not enabled: %s", exc)
+    return False
+
+
+def _half_dtype() -> torch.dtype:
+    """Return bf16 on Ampere+ GPUs (same speed, wider range), else fp16."""
+    try:
+        major, _ = torch.cuda.get_device_capability()
+    except Exception:
+        return torch.float16
+    return torch.bfloat16 if major >= 8 else torch.float16
+
+
+def _is_low_vram(threshold_bytes: int = LOW_VRAM_BYTES) -> bool:
+    """Return True if the current CUDA device has less memory than the threshold."""
+    try:
+        return torch.cuda.get_device_properties(0).total_memory < threshold_bytes
+    except Exception:
+        return False
+
+
+def _try_enable_sdpa(pipe: StableDiffusionPipeline) -> bool:
+    """Install the PyTorch SDPA attention processor on UNet and VAE.
+
+    Returns:
+        True if the processor was installed, False otherwise.
+    """
+    if not hasattr(torch.nn.functional, "scaled_dot_product_attention"):
+        logger.info("SDPA not available in torch %s.", torch.__version__)
+        return False
+
+    try:
+        from diffusers.models.attention_processor import AttnProcessor2_0
+
+        pipe.unet.set_attn_processor(AttnProcessor2_0())
+        pipe.vae.set_attn_processor(AttnProcessor2_0())
+        logger.info("Enabled SDPA (AttnProcessor2_0) attention.")
+        return True
+    except Exception as exc:
+        logger.info("SDPA attention not enabled: %s", exc)
+        return False
+
+
+def _try_compile(pipe: StableDiffusionPipeline) -> None:
+    """Compile the UNet and VAE decoder with torch.compile if supported."""
+    if not hasattr(torch, "compile"):
+        logger.info("torch.compile not available in torch %s.", torch.__version__)
+        return
+
+    try:
+        pipe.unet = torch.compile(pipe.unet, mode="reduce-overhead", fullgraph=False)
+        pipe.vae.decode = torch.compile(pipe.vae.decode, mode="reduce-overhead")
+        logger.info("Compiled UNet and VAE decoder (reduce-overhead).")
+    except Exception as exc:
+        logger.info("torch.compile not enabled: %s", exc)
+
+
+def _try_quantize(pipe: StableDiffusionPipeline, mode: str) -> None:
+    """Quantize the UNet in place with torchao.
+
+    Args:
+        pipe: Loaded pipeline.
+        mode: One of `QUANTIZE_MODES`, validated by `load_pipeline`.
+    """
+    try:
+        from torchao import quantization as tq
+
+        config = {
+            "int8_weight": tq.int8_weight_only,
+            "w8a8": tq.int8_dynamic_activation_int8_weight,
+            "fp8": tq.float8_dynamic_activation_float8_weight,
+        }[mode]()
+        tq.quantize_(pipe.unet, config)
+        logger.info("Quantized UNet (%s).", mode)
+    except Exception as exc:
+        logger.warning("UNet quantization (%s) not applied: %s", mode, exc)
+
+
+def _try_attach_deepcache(pipe: StableDiffusionPipeline) -> bool:
+    """Attach a (disabled) DeepCache helper to the pipeline if installed.
+
+    Returns:
+        True if the helper was attached, False otherwise.
+    """
+    try:
+        from DeepCache import DeepCacheSDHelper
+
+        helper = DeepCacheSDHelper(pipe=pipe)
+        helper.set_params(cache_interval=3, cache_branch_id=0)
+        pipe._deepcache_helper = helper
+        logger.info("DeepCache helper attached (interval=3, branch=0).")
+        return True
+    except Exception as exc:
+        logger.info("DeepCache not enabled: %s", exc)
+        return False
+
+
+@contextlib.contextmanager
+def deepcache_context(pipe: Any, steps: int) -> Iterator[None]:
+    """Enable DeepCache feature caching for one pipeline call.
+
+    Caching is applied only when the pipeline carries a DeepCache helper
+    and the run has at least `DEEPCACHE_MIN_STEPS` steps; few-step
+    (Turbo) runs are left untouched.
+
+    Args:
+        pipe: Pipeline about to be called.
+        steps: Number of inference steps for the call.
+    """
+    helper = getattr(pipe, "_deepcache_helper", None)
+    if helper is None or steps < DEEPCACHE_MIN_STEPS:
+        yield
+        return
+
+    helper.enable()
+    try:
+        yield
+    finally:
+        helper.disable()
 
 
 def load_pipeline(
@@ -34,22 +177,55 @@ def load_pipeline(
     enable_xformers: bool = False,
     torch_dtype: Optional[torch.dtype] = None,
     scheduler: any = None,
+    use_compile: bool = True,
+    quantize: Optional[str] = None,
+    offload: Optional[str] = None,
+    cpu_bf16: bool = False,
+    deepcache: bool = False,
 ) -> StableDiffusionPipeline:
     """Load the Stable Diffusion pipeline with optional scheduler and xFormers.
 
     Args:
         model_id: HuggingFace model ID.
         device: Execution device ("cuda" or "cpu").
-        use_fp16: Enable float16 precision on CUDA.
-        enable_xformers: Whether to enable xFormers attention.
+        use_fp16: Enable half precision on CUDA (bf16 on Ampere and newer,
+            fp16 otherwise).
+        enable_xformers: Whether to enable xFormers attention when SDPA
+            is unavailable.
         torch_dtype: Explicit dtype override.
         scheduler: Optional preconfigured scheduler.
+        use_compile: Compile UNet and VAE decoder on CUDA. The first
+            calls pay the compile cost; `warmup_pipeline` absorbs it.
+        quantize: Optional UNet quantization: "int8_weight", "w8a8", or
+            "fp8" (FP8 needs an Ada/Hopper GPU). Requires torchao.
+        offload: Optional CPU offload on CUDA: "model" moves whole
+            sub-models to the GPU on demand, "sequential" does so per
+            layer (lowest VRAM, slowest). Disables torch.compile.
+        cpu_bf16: Opt in to bf16 autocast on CPUs with native bf16
+            support. Ignored on CUDA.
+        deepcache: Reuse UNet features across adjacent steps via the
+            optional DeepCache package (runs with >= 10 steps only).
+            Disables torch.compile, which cannot trace its patched forwards.
+
+    Raises:
+        ValueError: If `quantize` or `offload` is not a known mode.
 
     Returns:
         A configured `StableDiffusionPipeline` instance.
     """
+    # Validate modes before the (slow) model download and load
+    if quantize and quantize not in QUANTIZE_MODES:
+        msg = "Unknown quantization mode: %s (expected one of %s)"
+        raise ValueError(msg % (quantize, ", ".join(QUANTIZE_MODES)))
+    if offload and offload not in OFFLOAD_MODES:
+        msg = "Unknown offload mode: %s (expected one of %s)"
+        raise ValueError(msg % (offload, ", ".join(OFFLOAD_MODES)))
+    if offload and device != "cuda":
+        logger.info("CPU offload ignored on device %s.", device)
+        offload = None
+
     if torch_dtype is None:
-        torch_dtype = torch.float16 if use_fp16 and device == "cuda" else torch.float32
+        torch_dtype = _half_dtype() if use_fp16 and device == "cuda" else torch.float32
 
     if scheduler is None:
         try:
@@ -59,9 +235,13 @@ def load_pipeline(
                     subfolder="scheduler",
                 )
             else:
+                # DPM++ 2M Karras matches quality at ~15-20 steps
                 scheduler = DPMSolverMultistepScheduler.from_pretrained(
                     model_id,
                     subfolder="scheduler",
+                    algorithm_type="dpmsolver++",
+                    use_karras_sigmas=True,
+                    solver_order=2,
                 )
         except Exception:
             scheduler = None
@@ -79,16 +259,44 @@ def load_pipeline(
         safety_checker=None,
         scheduler=scheduler,
         use_auth_token=os.getenv("HUGGINGFACE_HUB_TOKEN"),
-    ).to(device)
+    )
 
-    try:
-        pipe.enable_attention_slicing()
-        logger.info("Enabled attention slicing.")
-    except Exception:
-        logger.info("Attention slicing not available.")
+    # Offload hooks manage device placement themselves
+    if offload == "model":
+        pipe.enable_model_cpu_offload()
+        logger.info("Enabled model CPU offload.")
+    elif offload == "sequential":
+        pipe.enable_sequential_cpu_offload()
+        logger.info("Enabled sequential CPU offload.")
+    else:
+        pipe = pipe.to(device)
 
-    if enable_xformers:
-        _try_enable_xformers(pipe)
+    # Fused attention kernels on CUDA; slicing only where memory is tight,
+    # since it serializes attention and slows down larger GPUs
+    fused_attention = device == "cuda" and not _is_low_vram() and _try_enable_sdpa(pipe)
+    if enable_xformers and not fused_attention:
+        fused_attention = _try_enable_xformers(pipe)
+
+    if not fused_attention:
+        try:
+            pipe.enable_attention_slicing()
+            logger.info("Enabled attention slicing.")
+        except Exception:
+            logger.info("Attention slicing not available.")
+
+    # NHWC lets cuDNN pick tensor-core conv kernels and oneDNN its
+    # blocked CPU conv kernels
+    pipe.unet.to(memory_format=torch.channels_last)
+    pipe.vae.to(memory_format=torch.channels_last)
+    logger.info("UNet/VAE memory format: channels_last.")
+
+    if quantize:
+        _try_quantize(pipe, quantize)
+
+    deepcache_attached = deepcache and _try_attach_deepcache(pipe)
+
+    if use_compile and device == "cuda" and not offload and not deepcache_attached:
+        _try_compile(pipe)
 
     try:
         if hasattr(pipe.vae, "enable_tiling"):
@@ -97,8 +305,26 @@ def load_pipeline(
     except Exception:
         pass
 
+    # Decode batched latents one image at a time
+    try:
+        if hasattr(pipe.vae, "enable_slicing"):
+            pipe.vae.enable_slicing()
+            logger.info("Enabled VAE slicing.")
+    except Exception:
+        pass
+
     if device == "cuda":
         torch.backends.cudnn.benchmark = True
+        # Route residual fp32 matmuls/convs through TF32 tensor cores
+        torch.set_float32_matmul_precision("high")
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.backends.cuda.matmul.allow_fp16_reduced_precision_reduction = True
+        torch.backends.cuda.matmul.allow_bf16_reduced_precision_reduction = True
+
+    # Weights already in half precision need no autocast at call time
+    pipe._is_half = torch_dtype in HALF_DTYPES
+    pipe._cpu_bf16 = cpu_bf16
 
     logger.info("Pipeline loaded.")
     return pipe
@@ -107,10 +333,31 @@ def load_pipeline(
 def warmup_pipeline(
     pipe: StableDiffusionPipeline,
     prompt: str = "A photo of a cat",
-    height: int = 512,
-    width: int = 512,
+    shapes: Optional[Sequence[Tuple[int, int]]] = None,
+    steps: int = 2,
+    guidance_scale: float = 7.5,
 ) -> None:
-    """Run a one-step warmup pass to initialize CUDA kernels."""
+    """Run short warmup passes to initialize CUDA kernels per resolution.
+
+    Each `(width, height)` bucket is snapped with `validate_resolution` and
+    run once with `steps` denoising steps, so cudnn autotuning, Dynamo
+    tracing and CUDA graph capture happen before the first user request.
+    Warm with the guidance the pipeline is served with: a scale above 1
+    runs the UNet on a batch of 2 (classifier-free guidance), a different
+    graph from the unguided batch of 1.
+
+    Args:
+        pipe: Loaded pipeline to warm up.
+        prompt: Dummy prompt used for the warmup passes.
+        shapes: `(width, height)` buckets to warm. Defaults to
+            `DEFAULT_WARMUP_SHAPES` (512x512 and 768x768).
+        steps: Inference steps per bucket.
+        guidance_scale: CFG scale for the warmup passes; use 0.0 for
+            guidance-free models such as SD-Turbo.
+    """
+    requested = shapes or DEFAULT_WARMUP_SHAPES
+    buckets = dict.fromkeys(validate_resolution(w, h) for w, h in requested)
+
     try:
         if hasattr(pipe, "parameters"):
             device = next(pipe.parameters()).device
@@ -120,22 +367,34 @@ def warmup_pipeline(
         device = "cuda"
 
     try:
-        gen_device = "cpu" if str(device) == "cpu" else device
-        generator = torch.Generator(gen_device).manual_seed(0)
-
-        logger.info("Warmup: running one-step inference to initialize kernels.")
-        pipe(
-            prompt=prompt,
-            num_inference_steps=1,
-            guidance_scale=0.0,
-            height=height,
-            width=width,
-            generator=generator,
-        )
-
-        if device == "cuda":
-            torch.cuda.empty_cache()
-
-        logger.info("Warmup complete.")
+        generator = get_generator(torch.device(device).type, 0)
+
+        with torch.inference_mode():
+            for width, height in buckets:
+                logger.info(
+                    "Warmup: %sx%s, %s steps, CFG %s.",
+                    width,
+                    height,
+                    steps,
+                    guidance_scale,
+                )
+                pipe(
+                    prompt=prompt,
+                    num_inference_steps=steps,
+                    guidance_scale=guidance_scale,
+                    height=height,
+                    width=width,
+                    generator=generator,
+                )
+
+        # Keep the allocator's cached blocks: releasing them here would only
+        # make the first real request re-allocate them from the driver.
+        if torch.device(device).type == "cuda":
+            logger.info(
+                "Warmup complete (%.0f MiB reserved).",
+                torch.cuda.memory_reserved() / 2**20,
+            )
+        else:
+            logger.info("Warmup complete.")
     except Exception as exc:
         logger.warning("Warmup failed: %s", exc)
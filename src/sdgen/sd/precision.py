@@ -0,0 +1,80 @@
+"""Autocast selection for Stable Diffusion inference.
+
+Pipelines run in their native dtype: CUDA pipelines are never wrapped in
+autocast, since fp16<->fp32 round-tripping on half-precision weights only
+adds overhead. On CPU, bf16 autocast is used only when the pipeline was
+loaded with `cpu_bf16=True` and the host exposes native bf16 support
+(AVX512-BF16 / AMX); emulated bf16 is much slower than plain fp32.
+"""
+
+from __future__ import annotations
+
+import contextlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, ContextManager
+
+import torch
+
+from sdgen.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_CPU_BF16_FLAGS = ("avx512_bf16", "amx_bf16", "amx_tile")
+
+
+@lru_cache(maxsize=1)
+def cpu_supports_bf16() -> bool:
+    """Return True if the CPU has native bf16 matmul support."""
+    for probe in ("_is_amx_tile_supported", "_is_avx512_bf16_supported"):
+        try:
+            if getattr(torch.cpu, probe)():
+                return True
+        except Exception:  # noqa: BLE001
+            pass
+
+    try:
+        mkldnn = torch.backends.mkldnn
+        if mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported():
+            return True
+    except Exception:  # noqa: BLE001
+        pass
+
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text(encoding="utf-8")
+    except OSError:
+        return False
+
+    flags = set(cpuinfo.split())
+    return any(flag in flags for flag in _CPU_BF16_FLAGS)
+
+
+def autocast_context(pipe: Any, device: str) -> ContextManager:
+    """Return the autocast context to wrap a pipeline call in.
+
+    Args:
+        pipe: Loaded diffusers pipeline.
+        device: Execution device ("cuda" or "cpu").
+
+    Returns:
+        A context manager: `torch.autocast` or `contextlib.nullcontext`.
+    """
+    if device == "cuda":
+        if not getattr(pipe, "_is_half", False):
+            _warn_fp32_cuda()
+        return contextlib.nullcontext()
+
+    if getattr(pipe, "_cpu_bf16", False) and cpu_supports_bf16():
+        # Weight-cast caching (cache_enabled) is on by default
+        return torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+
+    return contextlib.nullcontext()
+
+
+@lru_cache(maxsize=1)
+def _warn_fp32_cuda() -> None:
+    """Log once that a CUDA pipeline is running in full precision."""
+    logger.warning(
+        "CUDA pipeline is running in float32; load it with "
+        "load_pipeline(use_fp16=True) for faster inference."
+    )
@@ -0,0 +1,41 @@
+"""Seed and torch.Generator helpers shared by the generation entrypoints."""
+
+from __future__ import annotations
+
+import secrets
+import threading
+from typing import Dict
+
+import torch
+
+# Per-thread {device: Generator}; a Generator must not be reseeded while
+# another thread is sampling from it.
+_LOCAL = threading.local()
+
+
+def random_seed() -> int:
+    """Return a fresh non-negative 63-bit seed from OS entropy.
+
+    Unlike `torch.seed()`, this leaves torch's global RNG untouched.
+    """
+    return secrets.randbits(63)
+
+
+def get_generator(device: str, seed: int) -> torch.Generator:
+    """Return this thread's cached Generator for `device`, reseeded.
+
+    Args:
+        device: Torch device string ("cuda" or "cpu").
+        seed: Seed to apply.
+
+    Returns:
+        A `torch.Generator` seeded with `seed`.
+    """
+    cache: Dict[str, torch.Generator] = getattr(_LOCAL, "generators", None)
+    if cache is None:
+        cache = _LOCAL.generators = {}
+
+    gen = cache.get(device)
+    if gen is None:
+        gen = cache[device] = torch.Generator(device)
+    return gen.manual_seed(int(seed))
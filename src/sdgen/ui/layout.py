@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import queue
+import threading
 from typing import Any, Tuple
 
 import gradio as gr
+from PIL import Image
 
 from sdgen.sd.generator import generate_image
 from sdgen.sd.img2img import generate_img2img
-from sdgen.sd.models import Img2ImgConfig, Txt2ImgConfig
+from sdgen.sd.models import GenerationMetadata, Img2ImgConfig, Txt2ImgConfig
 from sdgen.ui.tabs import (
     build_history_tab,
     build_img2img_tab,
@@ -18,28 +22,60 @@ from sdgen.ui.tabs import (
 )
 from sdgen.upscaler.upscaler import Upscaler
 from sdgen.utils.common import pretty_json, to_pil
-from sdgen.utils.history import save_history_entry
+from sdgen.utils.history import assign_history_paths, save_history_entry
 from sdgen.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# History saves (PNG encode + disk writes) run off the request path
+_HISTORY_Q: queue.Queue = queue.Queue()
+
+
+def _history_worker() -> None:
+    """Persist queued history entries forever."""
+    while True:
+        meta, image = _HISTORY_Q.get()
+        try:
+            save_history_entry(meta, image)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Failed to save history entry: %s", exc)
+        finally:
+            _HISTORY_Q.task_done()
+
+
+threading.Thread(target=_history_worker, name="history-writer", daemon=True).start()
+
+
+def _queue_history_save(meta: GenerationMetadata, image: Image.Image) -> None:
+    """Schedule a history save and return immediately.
+
+    The entry id and image paths are assigned up front, so metadata
+    serialized after this call matches the stored entry. The image is
+    copied because PIL images are not safe to share with a thread that
+    encodes them concurrently.
+    """
+    assign_history_paths(meta)
+    _HISTORY_Q.put((meta, image.copy()))
+
 
 def _resolve_seed(value: Any) -> int | None:
     """Return integer seed if valid, otherwise None."""
-    if value is None:
+    if value is None or value == "":
         return None
     if isinstance(value, int):
         return value
-    text = str(value).strip()
-    if not text:
-        return None
     try:
-        return int(text)
-    except ValueError:
+        return int(value)
+    except (TypeError, ValueError):
         logger.warning("Invalid seed input: %s", value)
         return None
 
 
+def _pipe_device(pipe: Any) -> str:
+    """Return the device type a pipeline executes on, offload-aware."""
+    return getattr(pipe, "_execution_device", pipe.device).type
+
+
 def _update_steps_and_cfg(model):
     """Upate steps based on the model."""
     if model == "Turbo":
@@ -76,17 +112,14 @@ def _txt2img_handler(
         width=int(width),
         height=int(height),
         seed=_resolve_seed(seed),
-        device=pipe.device.type,
+        device=_pipe_device(pipe),
     )
 
     image, meta = generate_image(pipe, cfg)
 
-    try:
-        save_history_entry(meta, image)
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to save history entry: %s", exc)
-
-    return image, pretty_json(meta.to_dict())
+    _queue_history_save(meta, image)
+    payload = pretty_json(meta.to_dict())
+    return image, payload
 
 
 def _img2img_handler(
@@ -118,20 +151,17 @@ def _img2img_handler(
         width=pil_image.width,
         height=pil_image.height,
         seed=_resolve_seed(seed),
-        device=pipe.device.type,
+        device=_pipe_device(pipe),
     )
 
     image, meta = generate_img2img(pipe, cfg, pil_image)
 
-    try:
-        save_history_entry(meta, image)
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to save history entry: %s", exc)
-
-    return image, pretty_json(meta.to_dict())
+    _queue_history_save(meta, image)
+    payload = pretty_json(meta.to_dict())
+    return image, payload
 
 
-def _upscale_handler(
+async def _upscale_handler(
     input_image: Any,
     scale: str,
 ) -> Tuple[Any, str]:
@@ -147,54 +177,78 @@ def _upscale_handler(
     except Exception as exc:  # noqa: BLE001
         raise gr.Error("Scale must be numeric (2 or 4).") from exc
 
-    upscaler = Upscaler(scale=scale_int, prefer="ncnn")
-    out_image, meta = upscaler.upscale(pil_image)
-
-    try:
-        save_history_entry(meta, out_image)
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to save history entry: %s", exc)
-
-    return out_image, pretty_json(meta.to_dict())
-
-
-def make_img2img_handler(model_choice, pipes):
-    """Return handler for img2img generation."""
-
-    def handler(input_image, prompt, negative, strength, steps, guidance, seed):
-        return _img2img_handler(
+    # Engines are cached per scale in sdgen.upscaler.realesrgan; the first
+    # use of a scale loads its model, so keep construction off the event loop
+    upscaler = await asyncio.to_thread(Upscaler, scale=scale_int, prefer="ncnn")
+    out_image, meta = await upscaler.upscale_async(pil_image)
+
+    _queue_history_save(meta, out_image)
+    payload = pretty_json(meta.to_dict())
+    return out_image, payload
+
+
+class _PipeHandlers:
+    """Gradio callbacks bound to the loaded pipelines.
+
+    The selected model arrives as the first input of each event, so
+    switching the Model dropdown takes effect on the next generation.
+    """
+
+    __slots__ = ("txt2img_pipes", "img2img_pipes")
+
+    def __init__(self, txt2img_pipes: dict, img2img_pipes: dict) -> None:
+        """Store the pipeline maps keyed by model name."""
+        self.txt2img_pipes = txt2img_pipes
+        self.img2img_pipes = img2img_pipes
+
+    def txt2img(
+        self,
+        model_choice,
+        prompt,
+        negative,
+        steps,
+        guidance,
+        width,
+        height,
+        seed,
+    ):
+        """Handle a Text → Image generate click."""
+        return _txt2img_handler(
             model_choice,
-            pipes,
-            input_image,
+            self.txt2img_pipes,
             prompt,
             negative,
-            strength,
             steps,
             guidance,
+            width,
+            height,
             seed,
         )
 
-    return handler
-
-
-def make_txt2img_handler(model_choice, pipes):
-    """Return handler for txt2img generation."""
-
-    def handler(prompt, negative, steps, guidance, width, height, seed):
-        return _txt2img_handler(
+    def img2img(
+        self,
+        model_choice,
+        input_image,
+        prompt,
+        negative,
+        strength,
+        steps,
+        guidance,
+        seed,
+    ):
+        """Handle an Image → Image generate click."""
+        return _img2img_handler(
             model_choice,
-            pipes,
+            self.img2img_pipes,
+            input_image,
             prompt,
             negative,
+            strength,
             steps,
             guidance,
-            width,
-            height,
             seed,
         )
 
-    return handler
-
 
 def build_ui(txt2img_pipes: dict, img2img_pipes: dict) -> gr.Blocks:
     """Build the entire Gradio UI."""
@@ -219,12 +273,16 @@ SD1.5 produces much better results but takes 10 minutes on average \
 for generation on HF Spaces."
         )
 
+        handlers = _PipeHandlers(txt2img_pipes, img2img_pipes)
+
         txt_controls = build_txt2img_tab(
-            make_txt2img_handler(model_choice.value, txt2img_pipes),
+            handlers.txt2img,
+            model_choice=model_choice,
         )
 
         img_controls = build_img2img_tab(
-            make_img2img_handler(model_choice.value, img2img_pipes),
+            handlers.img2img,
+            model_choice=model_choice,
         )
 
         build_upscaler_tab(
@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import gradio as gr
 from PIL import Image
 
+try:
+    import pyvips
+except ImportError:  # optional, faster decode
+    pyvips = None
+
 from sdgen.utils.common import short_prompt
 from sdgen.utils.history import (
+    INDEX_FILE,
     delete_history_entry,
     list_history,
     load_entry,
@@ -17,34 +28,229 @@ from sdgen.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Dropdown choices shown per page; large choice lists make Gradio's
+# dropdown slow to open.
+PAGE_SIZE = 50
+
+# Below this many entries a plain scan is as cheap as the label map
+LINEAR_LOOKUP_MAX = 16
+
+# Longest side of history thumbnails
+THUMB_SIZE = 256
+
+# pyvips band count -> PIL mode (8-bit images only)
+_VIPS_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+# Rebuild the cached index at least this often, even if it looks unchanged
+INDEX_TTL_SECONDS = 86400
+
+# Full entry JSON kept for recently loaded entries
+ENTRY_CACHE_SIZE = 64
+
+# Recently loaded entry dicts, least recently used first
+_ENTRY_CACHE: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+_ENTRY_LOCK = threading.Lock()
+
+# Last built index, reused until the index file changes on disk
+_INDEX_CACHE: Dict[str, Any] = {
+    "stale": True,
+    "ts": 0.0,
+    "mtime": None,
+    "limit": None,
+    "ids": [],
+    "labels": (),
+    "entries": [],
+    "label_to_id": {},
+}
+
 
 # Internal helpers
 
 
+@lru_cache(maxsize=1024)
+def _label_cached(ts19: str, mode: str, prompt: str) -> str:
+    """Format a dropdown label from its (memoizable) parts."""
+    ts = ts19.replace("T", " ")
+    prompt = short_prompt(prompt, 60)
+    return f"{ts} — {mode} — {prompt}" if prompt else f"{ts} — {mode}"
+
+
 def _label(entry: Dict[str, Any]) -> str:
     """Human-readable dropdown label."""
-    ts = entry.get("timestamp", "")[:19].replace("T", " ")
-    mode = entry.get("mode", "unknown")
-    prompt = short_prompt(entry.get("prompt", ""), 60)
-    return f"{ts} — {mode} — {prompt}" if prompt else f"{ts} — {mode}"
+    return _label_cached(
+        entry.get("timestamp", "")[:19],
+        entry.get("mode", "unknown"),
+        entry.get("prompt", ""),
+    )
 
 
-def _build_index(limit: int = 500) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
-    """Load history index → (ids, labels, raw entries)."""
-    entries = list_history(limit)
-    ids = [e.get("id", "") for e in entries]
-    labels = [_label(e) for e in entries]
-    return ids, labels, entries
+def _index_mtime() -> Optional[int]:
+    """Return the index file's mtime in ns, or None if it does not exist."""
+    try:
+        return os.stat(INDEX_FILE).st_mtime_ns
+    except OSError:
+        return None
 
 
-def _id_from_label(label: str, entries: List[Dict[str, Any]]) -> Optional[str]:
-    """Resolve entry ID from label text."""
+def _invalidate_index() -> None:
+    """Force the next `_build_index` call to re-read the history index."""
+    _INDEX_CACHE["stale"] = True
+
+
+def _build_index(
+    limit: int = 500,
+) -> Tuple[List[str], Tuple[str, ...], List[Dict[str, Any]]]:
+    """Load history index → (ids, labels, raw entries).
+
+    The result is cached and only rebuilt when the index file changes or the
+    cache is older than `INDEX_TTL_SECONDS`.
+    """
+    cache = _INDEX_CACHE
+    mtime = _index_mtime()
+    now = time.monotonic()
+    if (
+        cache["stale"]
+        or cache["mtime"] != mtime
+        or cache["limit"] != limit
+        or now - cache["ts"] > INDEX_TTL_SECONDS
+    ):
+        ids: List[str] = []
+        label_list: List[str] = []
+        entries: List[Dict[str, Any]] = []
+        add_id, add_label, add_entry = ids.append, label_list.append, entries.append
+        for e in list_history(limit):
+            add_id(e.get("id", ""))
+            add_label(_label(e))
+            add_entry(e)
+        labels = tuple(label_list)
+
+        cache.update(
+            stale=False,
+            ts=now,
+            mtime=mtime,
+            limit=limit,
+            ids=ids,
+            labels=labels,
+            entries=entries,
+            # Reversed so the newest entry wins when labels collide
+            label_to_id=dict(zip(reversed(labels), reversed(ids))),
+        )
+    return cache["ids"], cache["labels"], cache["entries"]
+
+
+def _drop_from_index(entry_id: str) -> None:
+    """Remove `entry_id` from the cached index without re-reading the index file."""
+    cache = _INDEX_CACHE
+    rows = zip(cache["ids"], cache["labels"], cache["entries"])
+    rows = [row for row in rows if row[0] != entry_id]
+    ids = [row[0] for row in rows]
+    labels = tuple(row[1] for row in rows)
+    cache.update(
+        mtime=_index_mtime(),
+        ids=ids,
+        labels=labels,
+        entries=[row[2] for row in rows],
+        label_to_id=dict(zip(reversed(labels), reversed(ids))),
+    )
+
+
+@lru_cache(maxsize=32)
+def _decode_thumb(path: str) -> Image.Image:
+    """Decode a history thumbnail with the fastest available backend.
+
+    Uses libvips when `pyvips` is installed, otherwise Pillow. Results are
+    memoized per path and cleared whenever an entry is deleted.
+    """
+    if pyvips is not None:
+        try:
+            vimg = pyvips.Image.thumbnail(path, THUMB_SIZE)
+            mode = _VIPS_MODES.get(vimg.bands)
+            if mode and vimg.format == "uchar":
+                size = (vimg.width, vimg.height)
+                return Image.frombytes(mode, size, vimg.write_to_memory())
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("pyvips decode failed for %s: %s", path, exc)
+
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def _open_thumb(path: str) -> Image.Image:
+    """Return a private copy of the cached thumbnail for `path`.
+
+    Copies are cheap at thumbnail size and keep one session from seeing
+    changes another makes to a shared image object.
+    """
+    return _decode_thumb(path).copy()
+
+
+def _load_entry_cached(entry_id: str) -> Optional[Dict[str, Any]]:
+    """Memoized `load_entry`; cleared whenever an entry is deleted.
+
+    Missing or unreadable entries are not cached, so an entry whose JSON
+    is still being written shows up on the next load. Callers get their
+    own copy of the (flat) entry dict.
+    """
+    with _ENTRY_LOCK:
+        data = _ENTRY_CACHE.get(entry_id)
+        if data is not None:
+            _ENTRY_CACHE.move_to_end(entry_id)
+            return dict(data)
+
+    data = load_entry(entry_id)
+    if data is None:
+        return None
+
+    with _ENTRY_LOCK:
+        _ENTRY_CACHE[entry_id] = data
+        if len(_ENTRY_CACHE) > ENTRY_CACHE_SIZE:
+            _ENTRY_CACHE.popitem(last=False)
+    return dict(data)
+
+
+def _scan_for_label(label: str, entries: List[Dict[str, Any]]) -> Optional[str]:
+    """Resolve entry ID by formatting each entry's label."""
     for e in entries:
         if _label(e) == label:
             return e.get("id")
     return None
 
 
+def _id_from_label(label: str, entries: List[Dict[str, Any]]) -> Optional[str]:
+    """Resolve entry ID from label text.
+
+    Uses the label -> id map of the cached index; tiny histories and labels
+    from an older index build (e.g. another session's state) are resolved
+    by scanning `entries`.
+    """
+    if len(entries) < LINEAR_LOOKUP_MAX:
+        return _scan_for_label(label, entries)
+
+    entry_id = _INDEX_CACHE["label_to_id"].get(label)
+    if entry_id is not None:
+        return entry_id
+    return _scan_for_label(label, entries)
+
+
+def _page(
+    labels: Sequence[str],
+    query: str,
+    page: int,
+) -> Tuple[Dict[str, Any], int, str]:
+    """Filter labels by `query` and return (dropdown update, page, page info)."""
+    needle = (query or "").strip().lower()
+    matches = [lb for lb in labels if needle in lb.lower()] if needle else labels
+
+    last = max(0, (len(matches) - 1) // PAGE_SIZE)
+    page = min(max(0, int(page)), last)
+    choices = list(matches[page * PAGE_SIZE : (page + 1) * PAGE_SIZE])
+
+    dd = gr.update(choices=choices, value=choices[0] if choices else None)
+    info = f"Page {page + 1}/{last + 1} — {len(matches)} entries"
+    return dd, page, info
+
+
 # Operations
 
 
@@ -57,31 +263,42 @@ def load_from_dropdown(selected_label: str, entries: List[Dict[str, Any]]):
     if not entry_id:
         raise gr.Error("Entry not found.")
 
-    data = load_entry(entry_id)
+    data = _load_entry_cached(entry_id)
     if not data:
         raise gr.Error("Entry JSON missing.")
 
     thumb_path = data.get("thumbnail")
-    img = Image.open(thumb_path) if thumb_path else None
+    img = _open_thumb(thumb_path) if thumb_path else None
 
     return img, data
 
 
-def refresh_history():
+def search_history(query: str, labels: Sequence[str]):
+    """Filter dropdown choices by search text, back on the first page."""
+    return _page(labels, query, 0)
+
+
+def prev_page(query: str, page: int, labels: Sequence[str]):
+    """Show the previous page of dropdown choices."""
+    return _page(labels, query, page - 1)
+
+
+def next_page(query: str, page: int, labels: Sequence[str]):
+    """Show the next page of dropdown choices."""
+    return _page(labels, query, page + 1)
+
+
+def refresh_history(query: str):
     """Refresh dropdown + state.
 
     Clear output.
     """
     _, labels, entries = _build_index()
-    if labels:
-        dd = gr.update(choices=labels, value=labels[0])
-    else:
-        dd = gr.update(choices=[], value=None)
+    dd, page, info = _page(labels, query, 0)
+    return dd, entries, labels, page, info, None, {}
 
-    return dd, entries, None, {}
 
-
-def delete_entry(selected_label: str, entries: List[Dict[str, Any]]):
+def delete_entry(selected_label: str, entries: List[Dict[str, Any]], query: str):
     """Delete and refresh UI."""
     if not selected_label:
         raise gr.Error("Select an entry first.")
@@ -90,38 +307,54 @@ def delete_entry(selected_label: str, entries: List[Dict[str, Any]]):
     if not entry_id:
         raise gr.Error("Entry not found.")
 
+    # Only patch the cache in place if it reflects the index file right now
+    cache = _INDEX_CACHE
+    cache_current = not cache["stale"] and cache["mtime"] == _index_mtime()
+
     ok = delete_history_entry(entry_id)
     if not ok:
         raise gr.Error("Delete failed.")
 
-    _, labels, new_entries = _build_index()
-
-    if labels:
-        dd = gr.update(choices=labels, value=labels[0])
+    if cache_current:
+        _drop_from_index(entry_id)
     else:
-        dd = gr.update(choices=[], value=None)
+        _invalidate_index()
+    with _ENTRY_LOCK:
+        _ENTRY_CACHE.clear()
+    _decode_thumb.cache_clear()
+    _, labels, new_entries = _build_index()
+    dd, page, info = _page(labels, query, 0)
 
-    return None, {}, dd, new_entries
+    return None, {}, dd, new_entries, labels, page, info
 
 
 # UI
 
 
 def build_history_tab() -> None:
-    """History tab: dropdown, load button, delete, refresh."""
+    """History tab: searchable, paged dropdown, load, delete, refresh."""
     _, labels, entries = _build_index()
-    initial = labels[0] if labels else None
+    first_page = list(labels[:PAGE_SIZE])
+    _, _, initial_info = _page(labels, "", 0)
 
     with gr.Tab("History"):
         with gr.Row():
             # Left panel: controls
             with gr.Column(scale=1):
+                search = gr.Textbox(
+                    label="Search",
+                    placeholder="Filter by prompt, mode or date",
+                )
                 dropdown = gr.Dropdown(
                     label="History entries",
-                    choices=labels,
-                    value=initial,
+                    choices=first_page,
+                    value=first_page[0] if first_page else None,
                     interactive=True,
                 )
+                with gr.Row():
+                    prev_btn = gr.Button("◀ Prev")
+                    next_btn = gr.Button("Next ▶")
+                page_info = gr.Markdown(initial_info)
 
                 load_btn = gr.Button("Load entry")
                 refresh_btn = gr.Button("Refresh")
@@ -139,9 +372,29 @@ def build_history_tab() -> None:
                 )
 
         state = gr.State(entries)
+        labels_state = gr.State(labels)
+        page_state = gr.State(0)
 
         # Events
 
+        search.change(
+            fn=search_history,
+            inputs=[search, labels_state],
+            outputs=[dropdown, page_state, page_info],
+        )
+
+        prev_btn.click(
+            fn=prev_page,
+            inputs=[search, page_state, labels_state],
+            outputs=[dropdown, page_state, page_info],
+        )
+
+        next_btn.click(
+            fn=next_page,
+            inputs=[search, page_state, labels_state],
+            outputs=[dropdown, page_state, page_info],
+        )
+
         load_btn.click(
             fn=load_from_dropdown,
             inputs=[dropdown, state],
@@ -150,12 +403,12 @@ def build_history_tab() -> None:
 
         refresh_btn.click(
             fn=refresh_history,
-            inputs=None,
-            outputs=[dropdown, state, thumb, meta],
+            inputs=[search],
+            outputs=[dropdown, state, labels_state, page_state, page_info, thumb, meta],
         )
 
         delete_btn.click(
             fn=delete_entry,
-            inputs=[dropdown, state],
-            outputs=[thumb, meta, dropdown, state],
+            inputs=[dropdown, state, search],
+            outputs=[thumb, meta, dropdown, state, labels_state, page_state, page_info],
         )
@@ -21,12 +21,16 @@ class Img2ImgControls:
     seed: gr.Textbox
 
 
-def build_img2img_tab(handler: Callable[..., Tuple[Any, dict]]) -> Img2ImgControls:
+def build_img2img_tab(
+    handler: Callable[..., Tuple[Any, dict]],
+    model_choice: gr.Dropdown,
+) -> Img2ImgControls:
     """Build the Image → Image tab and connect it to the provided handler.
 
     Args:
-        handler: A callable accepting the UI inputs and returning:
-            (output_image, metadata_dict)
+        handler: A callable accepting the selected model name followed by
+            the UI inputs and returning: (output_image, metadata_dict)
+        model_choice: Model selector whose current value is passed to handler.
 
     Returns:
         Img2ImgControls: A container with references to UI components.
@@ -36,7 +40,7 @@ def build_img2img_tab(handler: Callable[..., Tuple[Any, dict]]) -> Img2ImgContro
             with gr.Column():
                 input_image = gr.Image(
                     label="Input Image",
-                    type="numpy",
+                    type="pil",
                 )
 
                 prompt = gr.Textbox(
@@ -103,6 +107,7 @@ the prompt more strictly. "
         generate_button.click(
             fn=handler,
             inputs=[
+                model_choice,
                 input_image,
                 prompt,
                 negative,
@@ -10,6 +10,10 @@ from sdgen.presets.styles import get_preset, list_presets
 from sdgen.ui.tabs.img2img_tab import Img2ImgControls
 from sdgen.ui.tabs.txt2img_tab import Txt2ImgControls
 
+# Presets are static, so resolve them once at import
+_LIST_PRESETS = list(list_presets())
+_PRESET_CACHE = {name: get_preset(name) for name in _LIST_PRESETS}
+
 
 def apply_preset(preset_name: Any) -> Tuple[Any, ...]:
     """Return values to populate txt2img and img2img controls.
@@ -27,7 +31,7 @@ def apply_preset(preset_name: Any) -> Tuple[Any, ...]:
     if not preset_name:
         raise gr.Error("Select a preset first.")
 
-    preset = get_preset(str(preset_name))
+    preset = _PRESET_CACHE.get(str(preset_name))
     if preset is None:
         raise gr.Error("Invalid preset selected.")
 
@@ -63,7 +67,7 @@ def build_presets_tab(
         with gr.Row():
             with gr.Column():
                 preset_name = gr.Dropdown(
-                    choices=list_presets(),
+                    choices=_LIST_PRESETS,
                     label="Select style",
                 )
                 apply_button = gr.Button("Apply Preset")
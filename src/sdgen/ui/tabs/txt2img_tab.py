@@ -24,11 +24,16 @@ class Txt2ImgControls:
     seed: gr.components.Textbox
 
 
-def build_txt2img_tab(handler: Callable[..., Tuple]) -> Txt2ImgControls:
+def build_txt2img_tab(
+    handler: Callable[..., Tuple],
+    model_choice: gr.components.Dropdown,
+) -> Txt2ImgControls:
     """Construct the Text → Image tab and bind the Generate button.
 
     Args:
         handler: Function that performs txt2img and returns (image, metadata).
+            It receives the selected model name as its first argument.
+        model_choice: Model selector whose current value is passed to handler.
 
     Returns:
         A Txt2ImgControls instance containing references to all UI controls.
@@ -97,7 +102,16 @@ the prompt more strictly. "
 
         generate_button.click(
             fn=handler,
-            inputs=[prompt, negative, steps, guidance, width, height, seed],
+            inputs=[
+                model_choice,
+                prompt,
+                negative,
+                steps,
+                guidance,
+                width,
+                height,
+                seed,
+            ],
             outputs=[out_image, out_meta],
         )
 
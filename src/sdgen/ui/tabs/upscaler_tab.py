@@ -14,7 +14,7 @@ def build_upscaler_tab(handler: Callable[..., tuple]) -> None:
             with gr.Column():
                 input_image = gr.Image(
                     label="Upload Image to Upscale",
-                    type="numpy",
+                    type="pil",
                 )
                 scale = gr.Radio(
                     choices=["2.0", "4.0"],
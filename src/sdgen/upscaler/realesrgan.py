@@ -7,6 +7,7 @@ This module exposes:
 
 from __future__ import annotations
 
+import threading
 from typing import Final
 
 from PIL import Image
@@ -22,6 +23,33 @@ _SCALE_MODEL_MAP: Final[dict[int, int]] = {
     4: 0,  # realesrgan-x4plus
 }
 
+# Inputs larger than this many pixels are upscaled tile by tile
+TILE_THRESHOLD_PIXELS: Final[int] = 512 * 512
+
+# One Realesrgan engine per scale, with a lock serializing calls into it;
+# loading weights is too slow to repeat, and a single ncnn instance is not
+# known to be safe for concurrent use.
+_ENGINE_CACHE: dict[int, tuple[Realesrgan, threading.Lock]] = {}
+_ENGINE_LOCK = threading.Lock()
+
+
+def _get_engine(scale: int) -> tuple[Realesrgan, threading.Lock]:
+    """Return the shared Realesrgan engine for `scale` and its call lock."""
+    with _ENGINE_LOCK:
+        engine = _ENGINE_CACHE.get(scale)
+        if engine is None:
+            model_index = _SCALE_MODEL_MAP[scale]
+            logger.info(
+                "Initializing NCNN RealESRGAN (scale=%s, model_index=%s)",
+                scale,
+                model_index,
+            )
+            engine = _ENGINE_CACHE[scale] = (
+                Realesrgan(model=model_index),
+                threading.Lock(),
+            )
+        return engine
+
 
 class NCNNUpscaler:
     """NCNN RealESRGAN engine using realesrgan-ncnn-py.
@@ -44,16 +72,9 @@ class NCNNUpscaler:
             raise ValueError(msg % scale)
 
         self.scale: int = scale
-        model_index = _SCALE_MODEL_MAP[scale]
-
-        logger.info(
-            "Initializing NCNN RealESRGAN (scale=%s, model_index=%s)",
-            scale,
-            model_index,
-        )
 
         try:
-            self.model = Realesrgan(model=model_index)
+            self.model, self._lock = _get_engine(scale)
         except Exception as exc:  # noqa: BLE001
             msg = "Failed to initialize Realesrgan engine: %s"
             logger.error(msg, exc)
@@ -82,4 +103,51 @@ class NCNNUpscaler:
             self.scale,
         )
 
-        return self.model.process_pil(image)
+        if image.width * image.height > TILE_THRESHOLD_PIXELS:
+            return self.upscale_tiled(image)
+        return self._process(image)
+
+    def _process(self, image: Image.Image) -> Image.Image:
+        """Run the shared engine on `image`, one call at a time."""
+        with self._lock:
+            return self.model.process_pil(image)
+
+    def upscale_tiled(
+        self,
+        image: Image.Image,
+        tile: int = 256,
+        overlap: int = 16,
+    ) -> Image.Image:
+        """Upscale `image` in tiles to bound peak memory.
+
+        Each `tile`-sized block is upscaled together with up to `overlap`
+        pixels of surrounding context, which is cropped away again before
+        pasting, so tile borders do not show seams.
+
+        Args:
+            image: A PIL.Image instance.
+            tile: Tile edge length in input pixels.
+            overlap: Context margin around each tile in input pixels.
+
+        Returns:
+            The upscaled PIL.Image.
+        """
+        scale = self.scale
+        width, height = image.size
+        out = None
+
+        for y in range(0, height, tile):
+            for x in range(0, width, tile):
+                x1, y1 = min(x + tile, width), min(y + tile, height)
+                px, py = max(x - overlap, 0), max(y - overlap, 0)
+                box = (px, py, min(x1 + overlap, width), min(y1 + overlap, height))
+
+                up = self._process(image.crop(box))
+                if out is None:
+                    out = Image.new(up.mode, (width * scale, height * scale))
+
+                left, top = (x - px) * scale, (y - py) * scale
+                right, bottom = left + (x1 - x) * scale, top + (y1 - y) * scale
+                out.paste(up.crop((left, top, right, bottom)), (x * scale, y * scale))
+
+        return out
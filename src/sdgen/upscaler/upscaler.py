@@ -10,7 +10,9 @@ Planned:
 
 from __future__ import annotations
 
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from PIL import Image
@@ -21,6 +23,10 @@ from sdgen.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# One worker per supported scale; calls into the same engine are serialized
+# by its lock in sdgen.upscaler.realesrgan
+_UPSCALE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="upscale")
+
 
 class Upscaler:
     """Unified high-level upscaler wrapper.
@@ -113,3 +119,18 @@ class Upscaler:
         )
 
         return out, meta
+
+    async def upscale_async(
+        self,
+        image: Image.Image,
+    ) -> tuple[Image.Image, GenerationMetadata]:
+        """Run `upscale` on the shared upscale pool without blocking the event loop.
+
+        Args:
+            image: Input PIL image.
+
+        Returns:
+            The upscaled PIL image and its metadata.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_UPSCALE_POOL, self.upscale, image)
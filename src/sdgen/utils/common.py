@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import Any
 
 import numpy as np
 from PIL import Image
 
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encode
+    orjson = None
 
+
+@lru_cache(maxsize=128)
 def validate_resolution(width: int, height: int) -> tuple[int, int]:
     """Clamp and align the resolution to multiples of 64 within the SD range.
 
@@ -22,8 +29,9 @@ def validate_resolution(width: int, height: int) -> tuple[int, int]:
     Returns:
         A (width, height) tuple aligned to the valid grid.
     """
-    width = (max(256, min(width, 768)) // 64) * 64
-    height = (max(256, min(height, 768)) // 64) * 64
+    # `& ~63` snaps a non-negative int down to a multiple of 64
+    width = min(768, max(256, int(width))) & ~63
+    height = min(768, max(256, int(height))) & ~63
     return width, height
 
 
@@ -50,21 +58,25 @@ def to_pil(image: Any) -> Image.Image:
     if isinstance(image, np.ndarray):
         arr = image
 
+        # Common case: contiguous uint8 RGB, nothing to convert
+        is_rgb8 = arr.dtype == np.uint8 and arr.ndim == 3 and arr.shape[2] == 3
+        if is_rgb8 and arr.flags.c_contiguous:
+            return Image.fromarray(arr)
+
         # Normalize floats to uint8 safely
         if np.issubdtype(arr.dtype, np.floating):
-            # Clip first to avoid wraparound
+            # Clip first to avoid wraparound; the clipped copy is scaled in
+            # place so the caller's array is untouched and no second float
+            # temporary is allocated.
             arr = np.clip(arr, 0.0, 1.0)
-            arr = (arr * 255.0).astype("uint8")
+            np.multiply(arr, 255.0, out=arr)
+            arr = arr.astype(np.uint8)
         elif arr.dtype != np.uint8:
             arr = arr.astype("uint8")
 
-        # Grayscale → RGB
-        if arr.ndim == 2:
-            arr = np.stack([arr] * 3, axis=-1)
-
-        # Drop alpha channel if present
-        if arr.ndim == 3 and arr.shape[2] == 4:
-            arr = arr[..., :3]
+        # Grayscale → RGB and RGBA → RGB (alpha dropped) in Pillow's C code
+        if arr.ndim == 2 or (arr.ndim == 3 and arr.shape[2] == 4):
+            return Image.fromarray(arr).convert("RGB")
 
         return Image.fromarray(arr)
 
@@ -83,6 +95,12 @@ def pretty_json(data: Any) -> str:
         A formatted JSON string. If serialization fails, a best-effort string
         representation is returned.
     """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass  # e.g. non-str keys; let the stdlib encoder try
+
     try:
         return json.dumps(data, ensure_ascii=False, indent=2)
     except Exception:
@@ -104,7 +122,8 @@ def short_prompt(text: str | None, max_len: int = 50) -> str:
     if not text:
         return ""
 
-    text = text.replace("\n", " ")
+    if "\n" in text:
+        text = text.replace("\n", " ")
     if len(text) <= max_len:
         return text
 
@@ -2,7 +2,7 @@
 
 This module handles:
 - Writing a GenerationMetadata entry (JSON + images)
-- Maintaining a compact index.json for fast history listing
+- Maintaining an append-only index.jsonl journal for fast history listing
 - Atomic writes to avoid corruption on crash
 - Optional deletion of individual history entries
 """
@@ -10,13 +10,34 @@ This module handles:
 from __future__ import annotations
 
 import json
+import logging
+import os
 import tempfile
+import threading
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from PIL import Image, features
 
-from PIL import Image
+try:
+    import orjson
+except ImportError:  # optional, faster JSON
+    orjson = None
 
 from sdgen.config import (
     HISTORY_ENTRIES_DIR,
@@ -24,55 +45,409 @@ from sdgen.config import (
     HISTORY_ROOT,
     HISTORY_THUMBS_DIR,
 )
-from sdgen.sd.models import GenerationMetadata, HistorySummary
+from sdgen.sd.models import GenerationMetadata, HistorySummary, now_iso
 from sdgen.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Ensure directories exist early
-for _path in (
-    HISTORY_ROOT,
-    HISTORY_ENTRIES_DIR,
-    HISTORY_THUMBS_DIR,
-    HISTORY_FULL_DIR,
-):
-    _path.mkdir(parents=True, exist_ok=True)
+# File contents: one bytes-like object or an iterable of byte chunks
+Payload = Union[bytes, bytearray, memoryview, Iterable[bytes]]
+StrPath = Union[str, Path]
+
+# Append-only journal of {"op": "add", "entry": {...}} / {"op": "del", "id": ...}
+# lines; replaying it yields the current index.
+INDEX_FILE = HISTORY_ROOT / "index.jsonl"
+
+# Pre-journal index (a single JSON array), migrated on first read
+LEGACY_INDEX_FILE = HISTORY_ROOT / "index.json"
+
+# The journal is compacted to one line per live entry past this size
+COMPACT_BYTES = 1024 * 1024
+
+# Serializes journal appends against compaction rewrites
+_INDEX_LOCK = threading.RLock()
+
+# Last replayed index (newest first) plus an id -> summary map of it, valid
+# while the journal's (mtime_ns, size) matches `key`
+_INDEX_CACHE: Dict[str, Any] = {"key": None, "index": [], "by_id": {}}
+
+# Permissions of files written via `_atomic_write`, whichever way they are staged
+_FILE_MODE = 0o644
 
-INDEX_FILE = HISTORY_ROOT / "index.json"
+# fdatasync skips the metadata flush fsync does; not available on macOS/Windows
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Newest entries kept in the index
+MAX_INDEX_ENTRIES = 500
+
+# Thumbnails are lossy WEBP (much faster to encode and ~3x smaller than PNG)
+# when Pillow was built with libwebp. Existing entries keep their paths.
+THUMB_FORMAT = "WEBP" if features.check("webp") else "PNG"
+_THUMB_SAVE_ARGS: Dict[str, Any] = (
+    {"format": "WEBP", "quality": 80, "method": 0}
+    if THUMB_FORMAT == "WEBP"
+    else {"format": "PNG", "compress_level": 1}
+)
+
+_ENTRIES_DIR = str(HISTORY_ENTRIES_DIR)
+_FULL_DIR = str(HISTORY_FULL_DIR)
+_THUMBS_DIR = str(HISTORY_THUMBS_DIR)
+_THUMB_SUFFIX = f".{THUMB_FORMAT.lower()}"
+
+# Write buffer sizes for the full PNG and the thumbnail (see `_save_buffered`)
+_FULL_BUFSIZE = 1 << 20
+_THUMB_BUFSIZE = 1 << 16
+
+# Full image and thumbnail are encoded in parallel; Pillow releases the GIL
+# while compressing and writing.
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="history-io")
+
+# Per-thread bulk-save state; `pending` holds deferred entry files and index
+# events while inside `bulk_history()`
+_BULK = threading.local()
 
 
 # Internal helpers
-def _atomic_write(path: Path, data: bytes) -> None:
-    """Write bytes atomically to avoid partial writes on crash."""
-    with tempfile.NamedTemporaryFile(dir=str(path.parent), delete=False) as tmp:
-        tmp.write(data)
-        tmp_path = Path(tmp.name)
-    tmp_path.replace(path)
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Encode `obj` as indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Encode `obj` as one compact, newline-terminated JSON line."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+    line = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return (line + "\n").encode("utf-8")
+
+
+def _fsync_dir(directory: StrPath) -> None:
+    """Flush a directory's entries (e.g. renames) to disk; no-op off POSIX."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path: StrPath, data: Payload) -> None:
+    """Write bytes atomically and durably to avoid partial writes on crash."""
+    _atomic_write_batch([(path, data)])
+
+
+def _atomic_write_batch(items: Sequence[Tuple[StrPath, Payload]]) -> None:
+    """Atomically write several files with a single sync pass.
+
+    Each payload is a bytes-like object or an iterable of byte chunks; the
+    latter is streamed through the file buffer without being joined first.
+    Every temp file is written and fdatasync'ed before any of them is
+    renamed into place, then each parent directory is fsync'ed once so the
+    renames themselves survive a crash.
+    """
+    staged: List[Tuple[str, StrPath]] = []
+    try:
+        for path, data in items:
+            _stage(path, data, staged)
+    except BaseException:
+        for tmp_path, _ in staged:
+            _unlink_quiet(tmp_path)
+        raise
+
+    for tmp_path, path in staged:
+        os.replace(tmp_path, path)
+    for directory in {os.path.dirname(path) for _, path in staged}:
+        _fsync_dir(directory)
+
+
+def _write_payload(handle: BinaryIO, data: Payload) -> None:
+    """Write `data` to `handle`, flush it and fdatasync the file."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        handle.write(data)
+    else:
+        handle.writelines(data)
+    handle.flush()
+    _fdatasync(handle.fileno())
+
+
+@lru_cache(maxsize=None)
+def _o_tmpfile_works(directory: str) -> bool:
+    """Probe once per directory whether O_TMPFILE + linkat is usable there."""
+    if not hasattr(os, "O_TMPFILE") or not os.path.isdir("/proc/self/fd"):
+        return False
+
+    probe = os.path.join(directory, f".{uuid.uuid4().hex}.probe")
+    try:
+        fd = os.open(directory, os.O_TMPFILE | os.O_WRONLY, 0o644)
+        try:
+            os.link(f"/proc/self/fd/{fd}", probe)
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        msg = "O_TMPFILE unusable in %s (%s); using named temp files"
+        logger.debug(msg, directory, exc)
+        return False
+
+    _unlink_quiet(probe)
+    return True
+
+
+def _stage(path: StrPath, data: Payload, staged: List[Tuple[str, StrPath]]) -> None:
+    """Write `data` to a synced temp file next to `path` and record it in `staged`.
+
+    On Linux the data goes to an unnamed O_TMPFILE inode that only gets a
+    directory entry (via linkat) once it is complete and synced, so a
+    crash mid-write never leaves a half-written temp file behind.
+    Filesystems without O_TMPFILE support use a named temp file instead.
+    Either way the file ends up with `_FILE_MODE` permissions.
+    """
+    directory = os.path.dirname(path)
+    if not _o_tmpfile_works(directory):
+        with tempfile.NamedTemporaryFile(dir=directory, delete=False) as tmp:
+            staged.append((tmp.name, path))
+            # mkstemp creates 0600 files
+            if hasattr(os, "fchmod"):
+                os.fchmod(tmp.fileno(), _FILE_MODE)
+            _write_payload(tmp, data)
+        return
+
+    fd = os.open(directory, os.O_TMPFILE | os.O_WRONLY, _FILE_MODE)
+    with os.fdopen(fd, "wb") as handle:
+        # Match the fallback exactly instead of leaving the mode to the umask
+        os.fchmod(fd, _FILE_MODE)
+        _write_payload(handle, data)
+        tmp_name = os.path.join(directory, f".{uuid.uuid4().hex}.tmp")
+        # linkat(AT_SYMLINK_FOLLOW) through /proc gives the inode a name
+        os.link(f"/proc/self/fd/{fd}", tmp_name)
+    staged.append((tmp_name, path))
+
+
+def _replay(journal: bytes) -> List[Dict[str, Any]]:
+    """Replay journal lines into the live index, newest first."""
+    live: Dict[Any, Dict[str, Any]] = {}
+    for line in journal.splitlines():
+        if not line.strip():
+            continue
+        try:
+            event = _loads(line)
+        except ValueError:
+            continue  # torn last line after a crash
+
+        op = event.get("op")
+        if op == "add":
+            entry = event.get("entry") or {}
+            # Re-adding an id moves it to the newest position
+            live.pop(entry.get("id"), None)
+            live[entry.get("id")] = entry
+        elif op == "del":
+            live.pop(event.get("id"), None)
+
+    return list(reversed(live.values()))[:MAX_INDEX_ENTRIES]
+
+
+def _apply_event(
+    index: List[Dict[str, Any]],
+    event: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Return `index` (newest first) with a single journal event applied."""
+    if event.get("op") == "add":
+        entry = event["entry"]
+        rest = [e for e in index if e.get("id") != entry.get("id")]
+        return ([entry] + rest)[:MAX_INDEX_ENTRIES]
+    if event.get("op") == "del":
+        return [e for e in index if e.get("id") != event.get("id")]
+    return index
+
+
+def _remember_index(st: os.stat_result, index: List[Dict[str, Any]]) -> None:
+    """Cache `index` as the parsed form of the journal with stat `st`."""
+    _INDEX_CACHE.update(
+        key=(st.st_mtime_ns, st.st_size),
+        index=index,
+        by_id={e.get("id"): e for e in index},
+    )
+
+
+def _cached_index() -> List[Dict[str, Any]]:
+    """Return the cached index list, replaying the journal if it changed.
+
+    A missing index is migrated from the legacy index.json or, failing
+    that, rebuilt from the entry files. Callers must not mutate the result.
+    """
+    with _INDEX_LOCK:
+        try:
+            st = INDEX_FILE.stat()
+        except FileNotFoundError:
+            _INDEX_CACHE.update(key=None, index=[], by_id={})
+            return _migrate_legacy_index() or _rebuild_index()
+
+        if _INDEX_CACHE["key"] == (st.st_mtime_ns, st.st_size):
+            return _INDEX_CACHE["index"]
+
+        try:
+            index = _replay(INDEX_FILE.read_bytes())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to read history index, rebuilding: %s", exc)
+            return _rebuild_index()
+
+        _remember_index(st, index)
+        return index
 
 
 def _read_index() -> List[Dict[str, Any]]:
-    """Return list of summary dicts from index.json."""
-    if not INDEX_FILE.exists():
+    """Return list of summary dicts from the index journal, newest first.
+
+    The replayed index is cached until the journal's mtime or size changes;
+    callers get their own shallow copy.
+    """
+    return list(_cached_index())
+
+
+def _lookup_entry(entry_id: str) -> Optional[Dict[str, Any]]:
+    """Return the index summary for `entry_id` in O(1), or None."""
+    with _INDEX_LOCK:
+        _cached_index()
+        return _INDEX_CACHE["by_id"].get(entry_id)
+
+
+def _migrate_legacy_index() -> List[Dict[str, Any]]:
+    """Convert a pre-journal index.json into index.jsonl, if present."""
+    if not LEGACY_INDEX_FILE.exists():
         return []
     try:
-        with INDEX_FILE.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        index = _loads(LEGACY_INDEX_FILE.read_bytes())[:MAX_INDEX_ENTRIES]
     except Exception as exc:  # noqa: BLE001
-        logger.warning("Failed to read history index: %s", exc)
+        logger.warning("Failed to read legacy history index: %s", exc)
         return []
 
+    # Keep the legacy file unless the journal really replaced it
+    if not _write_index(index):
+        return index
+    LEGACY_INDEX_FILE.unlink(missing_ok=True)
+    logger.info("Migrated %s history entries to %s", len(index), INDEX_FILE.name)
+    return index
+
+
+def _rebuild_index() -> List[Dict[str, Any]]:
+    """Recreate the index from the per-entry metadata JSON files."""
+    fields = HistorySummary.__dataclass_fields__
+    index: List[Dict[str, Any]] = []
+    for path in HISTORY_ENTRIES_DIR.glob("*.json"):
+        try:
+            data = _loads(path.read_bytes())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Skipping unreadable history entry %s: %s", path.name, exc)
+            continue
+        index.append({f: data.get(f) for f in fields})
+
+    if not index:
+        return index
+
+    index.sort(key=lambda e: e.get("timestamp") or "", reverse=True)
+    index = index[:MAX_INDEX_ENTRIES]
+    _write_index(index)
+    logger.info("Rebuilt history index from %s entry files.", len(index))
+    return index
 
-def _write_index(index: List[Dict[str, Any]]) -> None:
-    """Persist index.json safely."""
+
+def _write_index(index: List[Dict[str, Any]]) -> bool:
+    """Persist `index` (newest first) as a freshly compacted journal.
+
+    Returns:
+        True if the journal was written, False if the write failed.
+    """
     try:
-        payload = json.dumps(
-            index,
-            ensure_ascii=False,
-            indent=2,
-        ).encode("utf-8")
-        _atomic_write(INDEX_FILE, payload)
+        # Streamed line by line: no joined copy of the whole index in memory
+        lines = (_dumps_line({"op": "add", "entry": e}) for e in reversed(index))
+        with _INDEX_LOCK:
+            _atomic_write(INDEX_FILE, lines)
+            _remember_index(INDEX_FILE.stat(), list(index))
     except Exception as exc:  # noqa: BLE001
         logger.exception("Failed to write history index: %s", exc)
+        return False
+    return True
+
+
+def _append_event(event: Dict[str, Any]) -> None:
+    """Durably append one event to the index journal, compacting when large."""
+    _append_events([event])
+
+
+def _append_events(events: Sequence[Dict[str, Any]]) -> None:
+    """Durably append `events` to the journal with one write and one sync."""
+    with _INDEX_LOCK:
+        if not INDEX_FILE.exists():
+            # Migrate or rebuild before the first append. A rebuild already
+            # picks up entry files written for these events; don't add twice.
+            present = {e.get("id") for e in _read_index()}
+            events = [
+                event
+                for event in events
+                if event.get("op") != "add" or event["entry"].get("id") not in present
+            ]
+        if not events:
+            return
+        line = b"".join(_dumps_line(event) for event in events)
+
+        fd = os.open(INDEX_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, _FILE_MODE)
+        try:
+            before = os.fstat(fd)
+            os.write(fd, line)
+            _fdatasync(fd)
+            after = os.fstat(fd)
+        finally:
+            os.close(fd)
+
+        if after.st_size > COMPACT_BYTES:
+            _write_index(_read_index())
+        elif _INDEX_CACHE["key"] == (before.st_mtime_ns, before.st_size):
+            # Cache was current: patch it instead of replaying the journal
+            index = _INDEX_CACHE["index"]
+            for event in events:
+                index = _apply_event(index, event)
+            _remember_index(after, index)
+
+
+def _paths(entry_id: str) -> Tuple[str, str, str]:
+    """Return (entry JSON, full image, thumbnail) paths for `entry_id`.
+
+    Plain strings built from pre-stringified directories, so the hot save
+    and delete paths allocate no Path objects.
+    """
+    return (
+        f"{_ENTRIES_DIR}{os.sep}{entry_id}.json",
+        f"{_FULL_DIR}{os.sep}{entry_id}.png",
+        f"{_THUMBS_DIR}{os.sep}{entry_id}{_THUMB_SUFFIX}",
+    )
+
+
+def _unlink_quiet(path: StrPath) -> None:
+    """Remove a file, ignoring a missing file or other OS errors."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _save_buffered(image: Image.Image, path: str, bufsize: int, **params: Any) -> None:
+    """Encode `image` to `path` through a `bufsize`-byte write buffer.
+
+    Pillow's default file buffer is small, so a full-size PNG otherwise
+    reaches the kernel in many small write() calls.
+    """
+    with open(path, "wb", buffering=bufsize) as handle:
+        image.save(handle, **params)
 
 
 def _save_images(
@@ -80,25 +455,96 @@ def _save_images(
     image: Image.Image,
     thumb_max_size: int = 256,
 ) -> Tuple[str, str]:
-    """Save full PNG and resized thumbnail for given entry ID."""
-    full_path = HISTORY_FULL_DIR / f"{entry_id}.png"
-    thumb_path = HISTORY_THUMBS_DIR / f"{entry_id}.png"
+    """Save full PNG and resized (WEBP if supported) thumbnail for given entry ID.
+
+    `image` is left unchanged; the thumbnail is built from a reduced copy,
+    so the full frame is never duplicated.
+    """
+    _, full_path, thumb_path = _paths(entry_id)
 
-    image.save(full_path, format="PNG")
+    # Integer box-reduce first (returns a new image), then a cheap bilinear
+    # pass; LANCZOS is wasted effort at thumbnail size. Done before the
+    # encodes start so no image is read by two threads at once.
+    thumb = image.reduce(max(1, min(image.size) // thumb_max_size))
+    thumb.thumbnail((thumb_max_size, thumb_max_size), Image.BILINEAR)
 
-    thumb = image.copy()
-    thumb.thumbnail((thumb_max_size, thumb_max_size), Image.LANCZOS)
-    thumb.save(thumb_path, format="PNG")
+    # zlib level 3 is far cheaper than the default 6 for a few % more bytes
+    full_future = _IO_POOL.submit(
+        _save_buffered, image, full_path, _FULL_BUFSIZE, format="PNG", compress_level=3
+    )
+    thumb_future = _IO_POOL.submit(
+        _save_buffered, thumb, thumb_path, _THUMB_BUFSIZE, **_THUMB_SAVE_ARGS
+    )
+    full_future.result()
+    thumb_future.result()
 
-    return str(full_path), str(thumb_path)
+    return full_path, thumb_path
+
+
+def _bulk_pending() -> Optional[Tuple[List[Tuple[str, bytes]], List[Dict[str, Any]]]]:
+    """Return this thread's (entry files, index events) buffers in bulk mode."""
+    return getattr(_BULK, "pending", None)
 
 
 # Public API
+@contextmanager
+def bulk_history() -> Iterator[None]:
+    """Defer entry-file and index writes of saves in this block to its end.
+
+    Meant for bulk imports: instead of an atomic, synced write plus a
+    journal append per entry, all entry JSON files are written in one
+    `_atomic_write_batch` pass and all index events in a single append and
+    fdatasync when the block exits (also on error). Images are still
+    written immediately. Until then the new entries are not visible to
+    `list_history` or `load_entry`, and a crash loses the whole batch.
+    Nested blocks on the same thread flush with the outermost one.
+    """
+    if _bulk_pending() is not None:
+        yield
+        return
+
+    files: List[Tuple[str, bytes]] = []
+    events: List[Dict[str, Any]] = []
+    _BULK.pending = (files, events)
+    try:
+        yield
+    finally:
+        _BULK.pending = None
+        try:
+            _atomic_write_batch(files)
+            _append_events(events)
+        except Exception as exc:  # noqa: BLE001
+            msg = "Failed to flush %s bulk history entries: %s"
+            logger.exception(msg, len(events), exc)
+        else:
+            if events:
+                logger.info("Flushed %s bulk history entries", len(events))
+
+
+def assign_history_paths(metadata: GenerationMetadata) -> GenerationMetadata:
+    """Fill in the id, timestamp and image paths an entry will be saved under.
+
+    Lets callers show the final metadata before `save_history_entry` runs
+    (e.g. on a background thread). Existing id and timestamp are kept.
+
+    Args:
+        metadata: GenerationMetadata to update in place.
+
+    Returns:
+        The same metadata object.
+    """
+    metadata.id = metadata.id or str(uuid.uuid4())
+    _, metadata.full_image, metadata.thumbnail = _paths(metadata.id)
+    if not metadata.timestamp:
+        metadata.timestamp = now_iso()
+    return metadata
+
+
 def save_history_entry(
     metadata: GenerationMetadata,
     image: Image.Image,
 ) -> GenerationMetadata:
-    """Write a new history entry: images, metadata, and update index.json.
+    """Write a new history entry: images, metadata, and an index event.
 
     Args:
         metadata: Populated GenerationMetadata (without paths or id)
@@ -107,31 +553,21 @@ def save_history_entry(
     Returns:
         The metadata object, updated with id, timestamp, and image paths.
     """
-    entry_id = metadata.id or str(uuid.uuid4())
-    full_path, thumb_path = _save_images(entry_id, image)
-
-    # Update metadata object
-    metadata.id = entry_id
-    metadata.full_image = full_path
-    metadata.thumbnail = thumb_path
-    if not metadata.timestamp:
-        metadata.timestamp = datetime.utcnow().isoformat()
-
-    # Write metadata JSON
-    entry_file = HISTORY_ENTRIES_DIR / f"{entry_id}.json"
-    try:
-        payload = json.dumps(
-            metadata.to_dict(),
-            ensure_ascii=False,
-            indent=2,
-        ).encode("utf-8")
-        _atomic_write(entry_file, payload)
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to write metadata file: %s", exc)
-
-    # Insert at top of index
+    assign_history_paths(metadata)
+    entry_id = metadata.id
+    _, thumb_path = _save_images(entry_id, image)
+
+    # Write metadata JSON, then record it in the index journal. Each save
+    # costs three syncs: the entry file's fdatasync, its directory's fsync
+    # and the journal append's fdatasync; `bulk_history()` amortizes them.
+    entry_file = _paths(entry_id)[0]
+    pending = _bulk_pending()
     try:
-        index = _read_index()
+        payload = _dumps(metadata.to_dict())
+        if pending is None:
+            _atomic_write(entry_file, payload)
+        else:
+            pending[0].append((entry_file, payload))
         summary = HistorySummary(
             id=entry_id,
             prompt=metadata.prompt,
@@ -142,15 +578,16 @@ def save_history_entry(
             timestamp=metadata.timestamp,
             thumbnail=thumb_path,
         )
-        # de-dupe old
-        index = [summary.to_dict()] + [e for e in index if e.get("id") != entry_id]
-        # cap history length
-        index = index[:500]
-        _write_index(index)
+        event = {"op": "add", "entry": summary.to_dict()}
+        if pending is None:
+            _append_event(event)
+        else:
+            pending[1].append(event)
     except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to update history index: %s", exc)
+        logger.exception("Failed to write history entry %s: %s", entry_id, exc)
 
-    logger.info("Saved history entry %s", entry_id)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Saved history entry %s", entry_id)
     return metadata
 
 
@@ -162,19 +599,18 @@ def list_history(n: int = 50) -> List[Dict[str, Any]]:
 
 def load_entry(entry_id: str) -> Optional[Dict[str, Any]]:
     """Return the full metadata dict for a specific entry_id, or None."""
-    path = HISTORY_ENTRIES_DIR / f"{entry_id}.json"
-    if not path.exists():
-        return None
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        with open(_paths(entry_id)[0], "rb") as handle:
+            return _loads(handle.read())
+    except FileNotFoundError:
+        return None
     except Exception as exc:  # noqa: BLE001
         logger.exception("Failed to load entry %s: %s", entry_id, exc)
         return None
 
 
 def delete_history_entry(entry_id: str) -> bool:
-    """Delete a history entry JSON + images and update index.json.
+    """Delete a history entry JSON + images and record it in the index.
 
     Args:
         entry_id: History entry ID to delete.
@@ -182,49 +618,18 @@ def delete_history_entry(entry_id: str) -> bool:
     Returns:
         True if an entry was removed, False if not found.
     """
-    index = _read_index()
-    new_index: List[Dict[str, Any]] = []
-    removed = False
-
-    for item in index:
-        if item.get("id") != entry_id:
-            new_index.append(item)
-            continue
-
-        removed = True
-        # Delete thumbnail
-        thumb = item.get("thumbnail")
-        if thumb:
-            thumb_path = Path(thumb)
-            if thumb_path.exists():
-                try:
-                    thumb_path.unlink()
-                except Exception:  # noqa: BLE001
-                    pass
-
-        # Delete full image (only known from metadata)
-        entry = load_entry(entry_id)
-        if entry:
-            full = entry.get("full_image")
-            if full:
-                full_path = Path(full)
-                if full_path.exists():
-                    try:
-                        full_path.unlink()
-                    except Exception:  # noqa: BLE001
-                        pass
-
-        # Delete entry file
-        json_path = HISTORY_ENTRIES_DIR / f"{entry_id}.json"
-        if json_path.exists():
-            try:
-                json_path.unlink()
-            except Exception:  # noqa: BLE001
-                pass
-
-    if not removed:
+    item = _lookup_entry(entry_id)
+    if item is None:
         return False
 
-    _write_index(new_index)
-    logger.info("Deleted history entry %s", entry_id)
+    # Paths are deterministic per id; the thumbnail's is taken from the
+    # index since its extension depends on when the entry was saved.
+    entry_file, full_path, _ = _paths(entry_id)
+    for path in (item.get("thumbnail"), full_path, entry_file):
+        if path:
+            _unlink_quiet(path)
+
+    _append_event({"op": "del", "id": entry_id})
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Deleted history entry %s", entry_id)
     return True
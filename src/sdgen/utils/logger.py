@@ -2,21 +2,35 @@
 
 This module centralizes logger configuration to ensure consistent formatting,
 file rotation, and prevention of duplicate handlers during repeated imports.
+Records are handed to a background listener thread through a queue, so
+callers never block on console or file I/O.
+
+The level of every sdgen logger comes from the `LOG_LEVEL` environment
+variable (default "INFO"); e.g. `LOG_LEVEL=WARNING` makes info calls
+return at the level check.
 """
 
 from __future__ import annotations
 
+import atexit
 import logging
+import os
+import queue
+import threading
 from logging import Handler, Logger
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from sdgen.config import LOGS_ROOT
 
-# Ensure logs directory exists
-LOGS_ROOT.mkdir(parents=True, exist_ok=True)
+# Level applied to every logger; unknown names fall back to INFO
+LOG_LEVEL: int = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+if not isinstance(LOG_LEVEL, int):
+    LOG_LEVEL = logging.INFO
 
 # Cache prevents repeated handler installation for the same logger name
 _LOGGER_CACHE: dict[str, Logger] = {}
+# Serializes first-time setup so concurrent callers cannot double-install
+_CACHE_LOCK = threading.Lock()
 
 
 def _build_handler() -> Handler:
@@ -36,12 +50,36 @@ def _build_handler() -> Handler:
     return handler
 
 
+def _build_stream_handler() -> Handler:
+    """Return a console handler with unified log formatting."""
+    stream = logging.StreamHandler()
+    fmt = "%(asctime)s [%(name)s][%(levelname)s] %(message)s"
+    stream.setFormatter(logging.Formatter(fmt))
+    return stream
+
+
+# Single listener thread drains the queue into the real handlers
+# (SimpleQueue: unbounded, no task tracking, cheaper put than queue.Queue)
+_LOG_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+# LOGS_ROOT is created by sdgen.config unless SDGEN_SKIP_FS_INIT=1; without
+# it, log to the console only.
+_HANDLERS = [_build_stream_handler()]
+if LOGS_ROOT.is_dir():
+    _HANDLERS.insert(0, _build_handler())
+_LISTENER = QueueListener(_LOG_QUEUE, *_HANDLERS, respect_handler_level=True)
+_LISTENER.start()
+atexit.register(_LISTENER.stop)
+
+# One QueueHandler shared by every logger; it only enqueues records
+_QUEUE_HANDLER = QueueHandler(_LOG_QUEUE)
+
+
 def get_logger(name: str) -> Logger:
     """Return a configured logger with rotating file and console handlers.
 
     The returned logger:
-    - uses INFO level by default
-    - writes to both stdout and a rotating log file
+    - uses the `LOG_LEVEL` level (INFO by default)
+    - writes to both stderr and a rotating log file via a queue
     - does not propagate to root logger
     - never duplicates handlers for the same name
 
@@ -51,22 +89,22 @@ def get_logger(name: str) -> Logger:
     Returns:
         A configured `logging.Logger` instance.
     """
-    if name in _LOGGER_CACHE:
-        return _LOGGER_CACHE[name]
+    cached = _LOGGER_CACHE.get(name)
+    if cached is not None:
+        return cached
 
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
+    with _CACHE_LOCK:
+        cached = _LOGGER_CACHE.get(name)
+        if cached is not None:
+            return cached
 
-    # Guard against accidentally adding handlers multiple times
-    if not logger.handlers:
-        logger.addHandler(_build_handler())
+        logger = logging.getLogger(name)
+        logger.setLevel(LOG_LEVEL)
 
-        stream = logging.StreamHandler()
-        stream.setFormatter(
-            logging.Formatter("%(asctime)s [%(name)s]" + "[%(levelname)s] %(message)s")
-        )
-        logger.addHandler(stream)
+        # Guard against accidentally adding handlers multiple times
+        if not logger.handlers:
+            logger.addHandler(_QUEUE_HANDLER)
 
-    logger.propagate = False
-    _LOGGER_CACHE[name] = logger
+        logger.propagate = False
+        _LOGGER_CACHE[name] = logger
     return logger